@@ -1,44 +1,78 @@
 # backend/app.py
 import os
+import json
 import uuid
+import time
 import random
-import smtplib
-import requests
-from dotenv import load_dotenv 
-load_dotenv()
+import threading
 from datetime import datetime, timedelta
-from email.message import EmailMessage
 
-from flask import Flask, request, jsonify, send_from_directory
+# Local .env for dev. Loaded before the imports below, which read their
+# settings at import; deployments set real env vars and skip dotenv entirely.
+# Searched for the way load_dotenv()'s find_dotenv() does it: from backend/
+# upward to the filesystem root, first hit wins.
+def _find_dotenv():
+    path = os.path.dirname(os.path.abspath(__file__))
+    while True:
+        candidate = os.path.join(path, ".env")
+        if os.path.isfile(candidate):
+            return candidate
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+_DOTENV_PATH = _find_dotenv()
+if _DOTENV_PATH:
+    from dotenv import load_dotenv
+
+    load_dotenv(_DOTENV_PATH)
+
+import click
+from flask import Blueprint, Flask, Response, current_app, request, jsonify, send_from_directory
+from flask.cli import with_appcontext
 from flask_cors import CORS
+from werkzeug.middleware.proxy_fix import ProxyFix
 from sqlalchemy import func, or_
 
-from models import db, Users, Internships, Applications
-
-app = Flask(__name__, static_folder=None)
-
-# Allow all origins for dev
-CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
+from models import (
+    db, Users, Internships, Applications, InternshipChanges,
+    InternshipStats, DomainStats, CollegeStats, DailyStats,
+)
+from catalog_index import index_stamp, load_index, VIEWS, INTERNSHIP_FIELDS, CARD_FIELDS
+from serialization import init_serialization, cached_json_response, catalog_cache
+from metrics import init_metrics, register_cache, register_rate_limiter, timed, timed_email
+from profiling import init_profiling
+from stats import record_application, rollup
+from passwords import hash_password, check_password
+from export import init_export
+from ratelimit import (
+    rate_limit, limiter, OTP_PER_IP, OTP_PER_EMAIL, LOGIN_PER_IP, LOGIN_PER_EMAIL,
+    OTP_VERIFY_PER_IP, OTP_VERIFY_PER_EMAIL, TRUSTED_PROXY_COUNT,
+)
+
+# All routes live on this blueprint; create_app() (bottom of file) builds
+# the Flask app around it.
+bp = Blueprint("api", __name__)
 
 # ---------------------------
 # DATABASE PATH
 # ---------------------------
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = os.path.join(BASE_DIR, "database.db")
-print("Using database:", DB_PATH)
-
-app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{DB_PATH}"
-app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
-
-db.init_app(app)
-with app.app_context():
-    db.create_all()
+DB_PATH = os.getenv("DATABASE_PATH", os.path.join(BASE_DIR, "database.db"))
 
 # ---------------------------
 # Upload folder (dev)
 # ---------------------------
-UPLOAD_FOLDER = os.path.join(BASE_DIR, "uploads")
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+UPLOAD_FOLDER = os.getenv("UPLOAD_FOLDER", os.path.join(BASE_DIR, "uploads"))
+
+# ---------------------------
+# Schema: created by `flask --app app migrate` / `python app.py migrate`
+# (and the gunicorn master), not on every import. AUTO_MIGRATE=1 restores
+# create-on-startup for throwaway setups.
+# ---------------------------
+AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "0") == "1"
 
 # ---------------------------
 # EMAIL CONFIG
@@ -46,13 +80,69 @@ os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 # For local Gmail SMTP (same as before)
 EMAIL_USER = os.getenv("EMAIL_USER")
 EMAIL_PASS = os.getenv("EMAIL_PASS")
+# Overridable so load tests can point at a local sink (loadtest/mail_sink.py)
+SMTP_HOST = os.getenv("SMTP_HOST", "smtp.gmail.com")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "465"))
+SMTP_USE_SSL = os.getenv("SMTP_USE_SSL", "1") != "0"
 
 # For production email API (Resend)
 RESEND_API_KEY = os.getenv("RESEND_API_KEY")
+RESEND_API_URL = os.getenv("RESEND_API_URL", "https://api.resend.com/emails")
 FROM_EMAIL = os.getenv("FROM_EMAIL", "InternConnect <onboarding@resend.dev>")
 # e.g. "InternConnect <no-reply@yourdomain.com>"
 
 
+def otp_email_content(otp):
+    """(subject, text body) of the OTP email."""
+    subject = "Your OTP Verification Code"
+    body_text = f"Your verification OTP is: {otp}\n\nThis code will expire in 5 minutes."
+    return subject, body_text
+
+
+def resend_request(to_email, subject, body_text):
+    """Keyword arguments for the Resend API call (shared with the async path)."""
+    return {
+        "url": RESEND_API_URL,
+        "headers": {
+            "Authorization": f"Bearer {RESEND_API_KEY}",
+            "Content-Type": "application/json",
+        },
+        "json": {
+            "from": FROM_EMAIL,
+            "to": [to_email],
+            "subject": subject,
+            "text": body_text,
+        },
+        "timeout": 10,
+    }
+
+
+def send_via_smtp(to_email, subject, body_text) -> bool:
+    # imported on first send; most processes never send mail
+    import smtplib
+    from email.message import EmailMessage
+
+    try:
+        msg = EmailMessage()
+        msg["Subject"] = subject
+        msg["From"] = EMAIL_USER
+        msg["To"] = to_email
+        msg.set_content(body_text)
+
+        # use SSL, 465 often works better behind some hosts
+        smtp_class = smtplib.SMTP_SSL if SMTP_USE_SSL else smtplib.SMTP
+        with smtp_class(SMTP_HOST, SMTP_PORT, timeout=10) as server:
+            server.login(EMAIL_USER, EMAIL_PASS)
+            server.send_message(msg)
+
+        print(f"[EMAIL] Sent OTP via Gmail SMTP to {to_email}")
+        return True
+    except Exception as e:
+        print("SMTP ERROR:", e)
+        return False
+
+
+@timed_email
 def send_email_otp(to_email, otp: int) -> bool:
     """
     Send OTP email.
@@ -63,26 +153,14 @@ def send_email_otp(to_email, otp: int) -> bool:
       3) Else -> fail.
     """
 
-    subject = "Your OTP Verification Code"
-    body_text = f"Your verification OTP is: {otp}\n\nThis code will expire in 5 minutes."
+    subject, body_text = otp_email_content(otp)
 
     # ---------- 1) Resend API (recommended for Render) ----------
     if RESEND_API_KEY:
+        import requests
+
         try:
-            resp = requests.post(
-                "https://api.resend.com/emails",
-                headers={
-                    "Authorization": f"Bearer {RESEND_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "from": FROM_EMAIL,
-                    "to": [to_email],
-                    "subject": subject,
-                    "text": body_text,
-                },
-                timeout=10,
-            )
+            resp = requests.post(**resend_request(to_email, subject, body_text))
             print("Resend response:", resp.status_code, resp.text)
             if resp.status_code in (200, 201):
                 print(f"[EMAIL] Sent OTP via Resend to {to_email}")
@@ -96,23 +174,7 @@ def send_email_otp(to_email, otp: int) -> bool:
 
     # ---------- 2) Gmail SMTP (for local dev) ----------
     if EMAIL_USER and EMAIL_PASS:
-        try:
-            msg = EmailMessage()
-            msg["Subject"] = subject
-            msg["From"] = EMAIL_USER
-            msg["To"] = to_email
-            msg.set_content(body_text)
-
-            # use SSL, 465 often works better behind some hosts
-            with smtplib.SMTP_SSL("smtp.gmail.com", 465, timeout=10) as server:
-                server.login(EMAIL_USER, EMAIL_PASS)
-                server.send_message(msg)
-
-            print(f"[EMAIL] Sent OTP via Gmail SMTP to {to_email}")
-            return True
-        except Exception as e:
-            print("SMTP ERROR:", e)
-            return False
+        return send_via_smtp(to_email, subject, body_text)
 
     # ---------- 3) No config ----------
     print("❗ EMAIL ERROR: No RESEND_API_KEY or EMAIL_USER/EMAIL_PASS configured.")
@@ -129,26 +191,105 @@ pending_password_otps = {} # tempToken -> email
 # ---------------------------
 # Helper: Convert internship row
 # ---------------------------
-def internship_to_dict(i: Internships):
-    return {
-        "id": i.id,
-        "name": getattr(i, "name", None) or "",
-        "domains": i.domains,
-        "skills": i.skills,
-        "paid": i.paid,
-        "duration": i.duration,
-        "role": i.role,
-        "location": i.location,
-        "mode": i.mode,
-        "prerequisites": i.prerequisites,
-        "stipend": i.stipend,
-        "other": i.other,
-    }
+def internship_to_dict(i: Internships, fields=INTERNSHIP_FIELDS):
+    """Works on model instances and on `with_entities` rows alike."""
+    data = {f: getattr(i, f, None) for f in fields}
+    if "name" in data:
+        data["name"] = data["name"] or ""
+    return data
+
+
+# ---------------------------
+# Helper: Sparse fieldsets for catalog responses
+# ---------------------------
+# List endpoints return the compact "card" projection unless the client asks
+# for more with `fields=` (comma-separated names, or "card" / "full").
+FIELD_PRESETS = {"card": CARD_FIELDS, "full": INTERNSHIP_FIELDS, "all": INTERNSHIP_FIELDS}
+
+
+def resolve_fields(raw, default=CARD_FIELDS):
+    """Turn a `fields=` value into an ordered tuple of columns (ValueError if unknown)."""
+    if not raw:
+        return default
+    if isinstance(raw, str):
+        if raw.strip().lower() in FIELD_PRESETS:
+            return FIELD_PRESETS[raw.strip().lower()]
+        raw = raw.split(",")
+    wanted = {str(f).strip() for f in raw if str(f).strip()}
+    unknown = wanted - set(INTERNSHIP_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    wanted.add("id")
+    return tuple(f for f in INTERNSHIP_FIELDS if f in wanted)
+
+
+def index_view_for(fields):
+    """Name of the pre-serialized index projection matching `fields`, if any."""
+    for view, (_, _, view_fields) in VIEWS.items():
+        if view_fields == fields:
+            return view
+    return None
+
+
+def internship_columns(fields):
+    return [getattr(Internships, f) for f in fields]
+
+
+# ---------------------------
+# Prebuilt catalog index (written by import_internships.py)
+# ---------------------------
+# Mapped lazily on first use; every worker maps the same file, so the
+# pre-serialized catalog lives once in the page cache. Without the file we
+# fall back to querying SQLite.
+#
+# The importer replaces the file on every run. At most every
+# CATALOG_INDEX_CHECK_SECONDS a request re-stats it and, when it changed
+# (or appeared / went away), maps the new one and drops the cached catalog
+# bodies built from the old one. Workers forked from a preloaded master
+# inherit its mapping and pick up new files the same way. Requests still
+# holding the old index finish on it; the mapping is freed after them.
+CATALOG_INDEX_CHECK_SECONDS = float(os.getenv("CATALOG_INDEX_CHECK_SECONDS", "1"))
+
+_catalog_index = None
+_catalog_index_loaded = False
+_catalog_index_stamp = None
+_catalog_index_next_check = 0.0
+_catalog_index_lock = threading.Lock()
+
+
+def get_catalog_index():
+    global _catalog_index, _catalog_index_loaded, _catalog_index_stamp, _catalog_index_next_check
+    now = time.monotonic()
+    if _catalog_index_loaded and now < _catalog_index_next_check:
+        return _catalog_index
+    with _catalog_index_lock:
+        if not _catalog_index_loaded or now >= _catalog_index_next_check:
+            stamp = index_stamp()
+            if not _catalog_index_loaded or stamp != _catalog_index_stamp:
+                index = load_index()
+                if _catalog_index_loaded:
+                    # entries are keyed on index.stamp, so this only frees
+                    # memory; late puts from the old index can't be hit
+                    catalog_cache.clear()
+                    print("Catalog index changed, remapped:", index.stamp if index else None)
+                _catalog_index = index
+                _catalog_index_stamp = index.stamp if index is not None else stamp
+                _catalog_index_loaded = True
+            _catalog_index_next_check = now + CATALOG_INDEX_CHECK_SECONDS
+    return _catalog_index
+
+
+def json_chunks_response(chunks, status=200):
+    """Response whose body is the concatenation of pre-encoded JSON chunks."""
+    # WSGI servers (gunicorn) only accept bytes, not memoryview slices of the
+    # index, so the chunks are joined: a single copy straight out of the mmap.
+    return Response(b"".join(chunks), status=status, mimetype="application/json")
 
 
 # ---------------------------
 # Helper: Serialize user for frontend  (fixed indentation)
 # ---------------------------
+@timed
 def _user_to_dict(u: Users):
     org = getattr(u, "org", None) or getattr(u, "organization", None) or ""
     profile_pic = getattr(u, "profile_pic", None) or None
@@ -219,7 +360,7 @@ def get_user_from_token_header(auth_header: str):
 # ---------------------------
 
 # Register (legacy)
-@app.route("/register", methods=["POST"])
+@bp.route("/register", methods=["POST"])
 def register():
     data = request.get_json(silent=True) or {}
 
@@ -242,15 +383,19 @@ def register():
     if Users.query.filter_by(email=email).first():
         return jsonify({"success": False, "message": "Email already exists"}), 200
 
-    user = Users(username=username, email=email, phone=phone, password=password)
+    user = Users(
+        username=username, email=email, phone=phone, password=hash_password(password)
+    )
     db.session.add(user)
     db.session.commit()
 
     return jsonify({"success": True, "message": "User registered successfully"}), 200
 
 
-# Login (legacy)
-@app.route("/login", methods=["POST"])
+# Login (legacy). Shares the /api/auth/login budget: same password check,
+# so a client can't double its guesses by alternating routes.
+@bp.route("/login", methods=["POST"])
+@rate_limit("api_auth_login", per_ip=LOGIN_PER_IP, per_email=LOGIN_PER_EMAIL)
 def login():
     data = request.get_json(silent=True) or {}
 
@@ -265,8 +410,9 @@ def login():
 
     user = Users.query.filter_by(email=email).first()
 
-    if not user or user.password != password:
+    if not check_password(user, password):
         return jsonify({"success": False, "message": "Invalid credentials"}), 200
+    db.session.commit()  # keeps a rehashed / migrated password
 
     return (
         jsonify(
@@ -285,16 +431,100 @@ def login():
 
 
 # Get all internships
-@app.route("/internships", methods=["GET"])
+@bp.route("/internships", methods=["GET"])
 def get_internships():
-    internships = Internships.query.all()
-    data = [internship_to_dict(i) for i in internships]
+    try:
+        fields = resolve_fields(request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    index = get_catalog_index()
+    view = index_view_for(fields)
+    if index is not None and view:
+        return cached_json_response(
+            ("internships", index.stamp, view),
+            lambda: [b'{"success":true,"count":%d,"results":' % len(index)]
+            + index.json_array(range(len(index)), view)
+            + [b"}"],
+        )
+
+    rows = Internships.query.with_entities(*internship_columns(fields)).all()
+    data = [internship_to_dict(r, fields) for r in rows]
     return jsonify({"success": True, "count": len(data), "results": data}), 200
 
 
+# Catalog delta for clients that keep a local copy
+@bp.route("/internships/changes", methods=["GET"])
+def internship_changes():
+    """
+    Everything changed after ?since=<version> (0 = the whole catalog), oldest
+    first, at most ?limit= entries per page. Clients store `version` and pass
+    it back; `reset` means their version is unknown here (DB rebuilt) and
+    they should drop their copy before applying this page.
+
+    While the catalog index is served, the feed stops at the version the
+    index was built from, so every id it hands out is already visible on
+    /internships/<id>; newer changes appear once the new index is mapped.
+    """
+    try:
+        since = int(request.args.get("since", 0))
+        limit = max(1, min(int(request.args.get("limit", 500)), 2000))
+        fields = resolve_fields(request.args.get("fields"), default=INTERNSHIP_FIELDS)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    latest = db.session.query(func.max(InternshipChanges.version)).scalar() or 0
+    reset = since > latest
+    if reset:
+        since = 0
+    index = get_catalog_index()
+    if index is not None and index.version is not None:
+        latest = min(latest, index.version)
+
+    changes = (
+        InternshipChanges.query.filter(
+            InternshipChanges.version > since, InternshipChanges.version <= latest
+        )
+        .order_by(InternshipChanges.version)
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    upsert_ids = [c.internship_id for c in changes if c.op == "upsert"]
+    rows = {}
+    if upsert_ids:
+        query = Internships.query.with_entities(*internship_columns(fields))
+        rows = {r.id: r for r in query.filter(Internships.id.in_(upsert_ids))}
+    upserts = [internship_to_dict(rows[i], fields) for i in upsert_ids if i in rows]
+    deletes = [c.internship_id for c in changes if c.internship_id not in rows]
+
+    return (
+        jsonify(
+            {
+                "success": True,
+                "version": changes[-1].version if changes else max(since, latest),
+                "has_more": has_more,
+                "reset": reset,
+                "upserts": upserts,
+                "deletes": deletes,
+            }
+        ),
+        200,
+    )
+
+
 # Get internship by ID
-@app.route("/internships/<int:internship_id>", methods=["GET"])
+@bp.route("/internships/<int:internship_id>", methods=["GET"])
 def internship_by_id(internship_id):
+    index = get_catalog_index()
+    if index is not None:
+        rec = index.get(internship_id)
+        if rec is None:
+            return jsonify({"success": False, "message": "Internship not found"}), 404
+        return json_chunks_response([b'{"success":true,"internship":', rec, b"}"])
+
     i = Internships.query.get(internship_id)
     if not i:
         return jsonify({"success": False, "message": "Internship not found"}), 404
@@ -302,10 +532,16 @@ def internship_by_id(internship_id):
 
 
 # Search internships
-@app.route("/internships/search", methods=["POST"])
+@bp.route("/internships/search", methods=["POST"])
+@timed
 def internship_search():
     filters = request.get_json(silent=True) or {}
 
+    try:
+        fields = resolve_fields(filters.get("fields") or request.args.get("fields"))
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
     domain_filters = filters.get("domain")
     skill_filters = filters.get("skill")
     location = filters.get("location")
@@ -316,6 +552,39 @@ def internship_search():
     page_size = int(filters.get("page_size", 20))
     offset = (page - 1) * page_size
 
+    index = get_catalog_index()
+    view = index_view_for(fields)
+    if index is not None and view:
+        def build_page():
+            matches = index.search(
+                {
+                    "domains": domain_filters,
+                    "skills": skill_filters,
+                    "location": location,
+                    "mode": mode,
+                    "paid": paid,
+                }
+            )
+            start = max(offset, 0)
+            page_rows = matches[start: start + max(page_size, 0)]
+            return (
+                [b'{"success":true,"count":%d,"results":' % len(matches)]
+                + index.json_array(page_rows, view)
+                + [b"}"]
+            )
+
+        # the catalog is immutable for the lifetime of the mapped index, so a
+        # given filter set always yields the same body; keyed on the index
+        # so a body built from a replaced one can never be served again
+        cache_key = (
+            "search",
+            index.stamp,
+            view,
+            json.dumps(filters, sort_keys=True, default=str),
+            request.args.get("fields"),
+        )
+        return cached_json_response(cache_key, build_page)
+
     query = Internships.query
 
     if domain_filters:
@@ -354,14 +623,19 @@ def internship_search():
         query = query.filter(func.lower(Internships.paid).like(f"%{paid.lower()}%"))
 
     total = query.count()
-    rows = query.offset(offset).limit(page_size).all()
-    results = [internship_to_dict(r) for r in rows]
+    rows = (
+        query.with_entities(*internship_columns(fields))
+        .offset(offset)
+        .limit(page_size)
+        .all()
+    )
+    results = [internship_to_dict(r, fields) for r in rows]
 
     return jsonify({"success": True, "count": total, "results": results}), 200
 
 
 # SIMPLE APPLY (matches your DB) + bump applied_count
-@app.route("/apply", methods=["POST"])
+@bp.route("/apply", methods=["POST"])
 def apply():
     data = request.get_json(silent=True) or {}
 
@@ -388,9 +662,14 @@ def apply():
     )
 
     db.session.add(application)
+    db.session.commit()
 
-    # update user's applied_count, if that email exists
+    # update user's applied_count, if that email exists, and the summary
+    # tables behind /stats. Own transaction, so a failure here can't lose
+    # the application; later applications (or migrate) count whatever it missed.
     try:
+        record_application(application)
+
         email = (data["email"] or "").strip().lower()
         user = Users.query.filter(func.lower(Users.email) == email).first()
         if user:
@@ -401,16 +680,110 @@ def apply():
         db.session.commit()
     except Exception as e:
         db.session.rollback()
-        print("WARN: application saved but failed to bump applied_count:", e)
+        print(f"WARN: application {application.id} saved; applied_count / stats not updated:", e)
         return jsonify({"success": True, "message": "Application submitted"}), 200
 
     return jsonify({"success": True, "message": "Application submitted"}), 200
 
 
+# ---------------------------------------------------------------
+# Application stats (summary tables kept by stats.py)
+# ---------------------------------------------------------------
+def _int_arg(name, default, maximum):
+    try:
+        return max(1, min(int(request.args.get(name, default)), maximum))
+    except ValueError:
+        return default
+
+
+@bp.route("/stats/internships/<int:internship_id>", methods=["GET"])
+def stats_internship(internship_id):
+    row = db.session.get(InternshipStats, internship_id)
+    return (
+        jsonify(
+            {
+                "success": True,
+                "internship_id": internship_id,
+                "applications": row.applications if row else 0,
+            }
+        ),
+        200,
+    )
+
+
+@bp.route("/stats/internships", methods=["GET"])
+def stats_internships():
+    """?ids=1,2,3 for badges on a page of cards, otherwise the top ?limit=."""
+    raw_ids = request.args.get("ids")
+    if raw_ids:
+        try:
+            ids = [int(x) for x in raw_ids.split(",") if x.strip()][:500]
+        except ValueError:
+            return jsonify({"success": False, "message": "ids must be integers"}), 400
+        rows = InternshipStats.query.filter(InternshipStats.internship_id.in_(ids)).all()
+        counts = {r.internship_id: r.applications for r in rows}
+        results = [{"internship_id": i, "applications": counts.get(i, 0)} for i in ids]
+    else:
+        rows = (
+            InternshipStats.query.order_by(InternshipStats.applications.desc())
+            .limit(_int_arg("limit", 20, 500))
+            .all()
+        )
+        results = [{"internship_id": r.internship_id, "applications": r.applications} for r in rows]
+    return jsonify({"success": True, "results": results}), 200
+
+
+@bp.route("/stats/domains", methods=["GET"])
+def stats_domains():
+    rows = DomainStats.query.order_by(DomainStats.applications.desc()).all()
+    return (
+        jsonify(
+            {
+                "success": True,
+                "results": [{"domain": r.domain, "applications": r.applications} for r in rows],
+            }
+        ),
+        200,
+    )
+
+
+@bp.route("/stats/colleges", methods=["GET"])
+def stats_colleges():
+    rows = (
+        CollegeStats.query.order_by(CollegeStats.applications.desc())
+        .limit(_int_arg("limit", 20, 500))
+        .all()
+    )
+    return (
+        jsonify(
+            {
+                "success": True,
+                "results": [{"college": r.college, "applications": r.applications} for r in rows],
+            }
+        ),
+        200,
+    )
+
+
+@bp.route("/stats/daily", methods=["GET"])
+def stats_daily():
+    """Last ?days= days that had applications, oldest first."""
+    rows = DailyStats.query.order_by(DailyStats.day.desc()).limit(_int_arg("days", 30, 366)).all()
+    return (
+        jsonify(
+            {
+                "success": True,
+                "results": [{"day": r.day, "applications": r.applications} for r in reversed(rows)],
+            }
+        ),
+        200,
+    )
+
+
 # ---------------------------------------------------------------
 # DEV compatibility endpoints for frontend (API-style)
 # ---------------------------------------------------------------
-@app.route("/api/auth/register", methods=["POST"])
+@bp.route("/api/auth/register", methods=["POST"])
 def api_auth_register():
     data = request.get_json(silent=True) or {}
     username = (data.get("username") or "").strip()
@@ -432,7 +805,9 @@ def api_auth_register():
     if Users.query.filter_by(email=email).first():
         return jsonify({"success": False, "message": "Email already exists"}), 409
 
-    user = Users(username=username, email=email, phone=phone, password=password)
+    user = Users(
+        username=username, email=email, phone=phone, password=hash_password(password)
+    )
     db.session.add(user)
     db.session.commit()
 
@@ -453,7 +828,8 @@ def api_auth_register():
     )
 
 
-@app.route("/api/auth/login", methods=["POST"])
+@bp.route("/api/auth/login", methods=["POST"])
+@rate_limit("api_auth_login", per_ip=LOGIN_PER_IP, per_email=LOGIN_PER_EMAIL)
 def api_auth_login():
     data = request.get_json(silent=True) or {}
     email = (data.get("email") or "").strip().lower()
@@ -466,9 +842,10 @@ def api_auth_login():
         )
 
     user = Users.query.filter_by(email=email).first()
-    if not user or user.password != password:
+    if not check_password(user, password):
         return jsonify({"success": False, "message": "Invalid credentials"}), 401
 
+    # set_user_token commits, which also saves a rehashed / migrated password
     token_value = str(uuid.uuid4())
     if not set_user_token(user, token_value):
         token_value = DEV_TOKEN
@@ -486,7 +863,7 @@ def api_auth_login():
     )
 
 
-@app.route("/api/me", methods=["GET"])
+@bp.route("/api/me", methods=["GET"])
 def api_me_get():
     auth = request.headers.get("Authorization", "")
     user = get_user_from_token_header(auth)
@@ -495,7 +872,7 @@ def api_me_get():
     return jsonify(_user_to_dict(user)), 200
 
 
-@app.route("/api/me", methods=["PUT", "POST"])
+@bp.route("/api/me", methods=["PUT", "POST"])
 def api_me_update():
     auth = request.headers.get("Authorization", "")
     user = get_user_from_token_header(auth)
@@ -521,7 +898,7 @@ def api_me_update():
     return jsonify({"success": True, "user": _user_to_dict(user)}), 200
 
 
-@app.route("/api/me/picture", methods=["PUT", "POST"])
+@bp.route("/api/me/picture", methods=["PUT", "POST"])
 def api_me_upload_pic():
     auth = request.headers.get("Authorization", "")
     user = get_user_from_token_header(auth)
@@ -537,7 +914,8 @@ def api_me_upload_pic():
 
     ext = os.path.splitext(f.filename)[1] or ".jpg"
     filename = f"user_{user.id}_{uuid.uuid4().hex}{ext}"
-    path = os.path.join(UPLOAD_FOLDER, filename)
+    os.makedirs(current_app.config["UPLOAD_FOLDER"], exist_ok=True)
+    path = os.path.join(current_app.config["UPLOAD_FOLDER"], filename)
     f.save(path)
 
     if hasattr(user, "profile_pic"):
@@ -547,14 +925,15 @@ def api_me_upload_pic():
     return jsonify({"success": True, "profile_pic": f"/uploads/{filename}"}), 200
 
 
-@app.route("/uploads/<path:filename>")
+@bp.route("/uploads/<path:filename>")
 def uploaded_file(filename):
-    return send_from_directory(UPLOAD_FOLDER, filename)
+    return send_from_directory(current_app.config["UPLOAD_FOLDER"], filename)
 
 # ---------------------------------------------------------------
 # ✅ NEW OTP ENDPOINTS — Registration
 # ---------------------------------------------------------------
-@app.route("/otp/register/request", methods=["POST"])
+@bp.route("/otp/register/request", methods=["POST"])
+@rate_limit("otp_register", per_ip=OTP_PER_IP, per_email=OTP_PER_EMAIL)
 def otp_register_request():
     data = request.get_json(silent=True) or {}
     email = (data.get("email") or "").strip().lower()
@@ -578,7 +957,8 @@ def otp_register_request():
     return jsonify({"success": True}), 200
 
 
-@app.route("/otp/register/verify", methods=["POST"])
+@bp.route("/otp/register/verify", methods=["POST"])
+@rate_limit("otp_register_verify", per_ip=OTP_VERIFY_PER_IP, per_email=OTP_VERIFY_PER_EMAIL)
 def otp_register_verify():
     data = request.get_json(silent=True) or {}
     email = (data.get("email") or "").strip().lower()
@@ -597,6 +977,8 @@ def otp_register_verify():
     username = data.get("username")
     phone = data.get("phone")
     password = data.get("password")
+    if password:
+        password = hash_password(password)
 
     user = Users(username=username, email=email, phone=phone, password=password)
     db.session.add(user)
@@ -616,15 +998,17 @@ def otp_register_verify():
 # ---------------------------------------------------------------
 # ✅ NEW OTP ENDPOINTS — Login
 # ---------------------------------------------------------------
-@app.route("/otp/login/request", methods=["POST"])
+@bp.route("/otp/login/request", methods=["POST"])
+@rate_limit("otp_login", per_ip=OTP_PER_IP, per_email=OTP_PER_EMAIL)
 def otp_login_request():
     data = request.get_json(silent=True) or {}
     email = (data.get("email") or "").strip().lower()
     password = (data.get("password") or "").strip()
 
     user = Users.query.filter_by(email=email).first()
-    if not user or user.password != password:
+    if not check_password(user, password):
         return jsonify({"success": False, "message": "Invalid credentials"}), 401
+    db.session.commit()  # keeps a rehashed / migrated password
 
     otp = random.randint(100000, 999999)
     temp_token = uuid.uuid4().hex
@@ -640,7 +1024,8 @@ def otp_login_request():
     return jsonify({"success": True, "tempToken": temp_token}), 200
 
 
-@app.route("/otp/login/verify", methods=["POST"])
+@bp.route("/otp/login/verify", methods=["POST"])
+@rate_limit("otp_login_verify", per_ip=OTP_VERIFY_PER_IP, per_email=OTP_VERIFY_PER_EMAIL)
 def otp_login_verify():
     data = request.get_json(silent=True) or {}
     temp = data.get("tempToken")
@@ -675,7 +1060,8 @@ def otp_login_verify():
     # ---------------------------------------------------------------
 # OTP endpoints — Forgot Password
 # ---------------------------------------------------------------
-@app.route("/otp/password/request", methods=["POST"])
+@bp.route("/otp/password/request", methods=["POST"])
+@rate_limit("otp_password", per_ip=OTP_PER_IP, per_email=OTP_PER_EMAIL)
 def otp_password_request():
     data = request.get_json(silent=True) or {}
     email = (data.get("email") or "").strip().lower()
@@ -701,7 +1087,7 @@ def otp_password_request():
 
     return jsonify({"success": True}), 200
 
-@app.route("/", methods=["GET"])
+@bp.route("/", methods=["GET"])
 def index():
     return {
         "success": True,
@@ -709,7 +1095,11 @@ def index():
         "endpoints": [
             "/internships",
             "/internships/search",
+            "/internships/changes",
             "/apply",
+            "/stats/internships",
+            "/stats/domains",
+            "/stats/daily",
             "/api/auth/login",
             "/api/auth/register",
         ],
@@ -717,7 +1107,8 @@ def index():
 
 
 
-@app.route("/otp/password/reset", methods=["POST"])
+@bp.route("/otp/password/reset", methods=["POST"])
+@rate_limit("otp_password_reset", per_ip=OTP_VERIFY_PER_IP, per_email=OTP_VERIFY_PER_EMAIL)
 def otp_password_reset():
     data = request.get_json(silent=True) or {}
     email = (data.get("email") or "").strip().lower()
@@ -741,8 +1132,7 @@ def otp_password_reset():
     if not user:
         return jsonify({"success": False, "message": "User not found"}), 404
 
-    # For now we keep plain-text password (same as your current logic).
-    user.password = new_password
+    user.password = hash_password(new_password)
     db.session.commit()
 
     # Clear used OTP
@@ -752,8 +1142,122 @@ def otp_password_reset():
 
 
 
+# ---------------------------
+# APP FACTORY
+# ---------------------------
+def create_app(config=None):
+    """
+    Build the Flask app. gunicorn calls this once in the master when
+    preloading (see gunicorn.conf.py), so workers inherit it copy-on-write.
+    Doesn't touch the database or filesystem unless CREATE_SCHEMA is set
+    (AUTO_MIGRATE=1); the schema comes from migrate().
+    """
+    app = Flask(__name__, static_folder=None)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{DB_PATH}"
+    app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
+    app.config["CREATE_SCHEMA"] = AUTO_MIGRATE
+    if config:
+        app.config.update(config)
+
+    # Allow all origins for dev
+    CORS(app, resources={r"/*": {"origins": "*"}}, supports_credentials=True)
+
+    # Per-route latency / SQL metrics on /metrics. Registered before compression
+    # so its after_request hook runs last and the timing includes encoding.
+    init_metrics(app)
+
+    # Opt-in per-request profiling (X-Profile header / PROFILE_SAMPLE_RATE)
+    init_profiling(app)
+
+    # orjson-backed jsonify (when installed) + gzip/brotli response compression
+    init_serialization(app)
+    register_cache("catalog", catalog_cache)
+    register_rate_limiter(limiter)
+
+    # Streaming CSV / NDJSON / Parquet / Arrow dumps at /export/<dataset>
+    init_export(app)
+
+    # Behind Render/nginx the client IP (used by the rate limiter) is in
+    # X-Forwarded-For; trust exactly as many hops as there are proxies
+    # (TRUSTED_PROXY_COUNT, see ratelimit.py).
+    if TRUSTED_PROXY_COUNT:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_COUNT, x_proto=TRUSTED_PROXY_COUNT)
+
+    db.init_app(app)
+    app.register_blueprint(bp)
+
+    app.cli.add_command(migrate_command)
+
+    print("Using database:", app.config["SQLALCHEMY_DATABASE_URI"])
+    if app.config["CREATE_SCHEMA"]:
+        migrate(app)
+    return app
+
+
+def migrate(app):
+    """
+    Create missing tables and indexes (idempotent; existing ones are left
+    alone), then bring the /stats summary tables up to date.
+    """
+    with app.app_context():
+        db.create_all()
+        # create_all() skips indexes on tables that already exist
+        for index in Applications.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
+        # existing applications (first deploy, bulk loads) past the watermark
+        rollup()
+        db.session.commit()
+    os.makedirs(app.config["UPLOAD_FOLDER"], exist_ok=True)
+
+
+@click.command("migrate")
+@with_appcontext
+def migrate_command():
+    """Create missing tables and indexes and catch up the stats tables."""
+    migrate(current_app)
+    print("✅ Schema up to date:", current_app.config["SQLALCHEMY_DATABASE_URI"])
+
+
+def warm_caches(app):
+    """
+    Map the catalog index and pre-build the compressed catalog bodies.
+
+    Called from the gunicorn master after preload, so every worker forks
+    with the index mapping and the encoded /internships bodies already in
+    memory.
+    """
+    if get_catalog_index() is None:
+        return
+    client = app.test_client()
+    for encoding in ("br", "gzip", "identity"):
+        for fields in ("card", "full"):
+            client.get(f"/internships?fields={fields}", headers={"Accept-Encoding": encoding})
+
+
+_app = None
+
+
+def __getattr__(name):
+    # `from app import app` / `gunicorn app:app` keep working: the default
+    # app is built on first access instead of at import time.
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = create_app()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 # ---------------------------
 # RUN SERVER
 # ---------------------------
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    import sys
+
+    dev_app = create_app()
+    migrate(dev_app)
+    if sys.argv[1:] == ["migrate"]:
+        print("✅ Schema up to date:", dev_app.config["SQLALCHEMY_DATABASE_URI"])
+    else:
+        dev_app.run(host="0.0.0.0", port=5000, debug=True)
@@ -0,0 +1,423 @@
+# backend/asgi.py
+"""
+ASGI entry point with async versions of the OTP and auth endpoints.
+
+These endpoints spend nearly all their time waiting on the mail provider and
+on small DB reads, so here they run on an event loop (aiosqlite for the DB,
+httpx for Resend) and one process can hold thousands of them in flight.
+Every other route is served by the regular Flask app, mounted underneath.
+
+Request/response contracts are the same as the Flask routes in app.py, and
+pending OTPs are shared with them (same in-process dicts).
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn
+"""
+import time
+import uuid
+import random
+import asyncio
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+import httpx
+from a2wsgi import WSGIMiddleware
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.cors import CORSMiddleware
+from starlette.responses import JSONResponse
+from starlette.routing import Mount, Route
+
+import app as backend
+from models import Users, Applications
+from metrics import email_send_duration, function_duration, request_duration
+from passwords import hash_password_async, check_password_async
+from ratelimit import (
+    rate_limit, OTP_PER_IP, OTP_PER_EMAIL, LOGIN_PER_IP, LOGIN_PER_EMAIL,
+    OTP_VERIFY_PER_IP, OTP_VERIFY_PER_EMAIL,
+)
+
+engine = create_async_engine(f"sqlite+aiosqlite:///{backend.DB_PATH}")
+Session = async_sessionmaker(engine, expire_on_commit=False)
+
+# created in lifespan so connections are pooled across requests
+http_client = None
+
+
+# ---------------------------
+# Helpers
+# ---------------------------
+async def _json(request):
+    """Same leniency as Flask's get_json(silent=True) or {}."""
+    try:
+        data = await request.json()
+    except ValueError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _fail(message, status):
+    return JSONResponse({"success": False, "message": message}, status_code=status)
+
+
+def _new_otp(store, email):
+    otp = random.randint(100000, 999999)
+    store[email] = {
+        "otp": str(otp),
+        "expires": datetime.utcnow() + timedelta(minutes=5),
+    }
+    return otp
+
+
+def _check_otp(rec, otp):
+    """Error response for a pending OTP record, or None when it matches."""
+    if not rec:
+        return _fail("OTP not requested", 400)
+    if datetime.utcnow() > rec["expires"]:
+        return _fail("OTP expired", 400)
+    if rec["otp"] != otp:
+        return _fail("Invalid OTP", 400)
+    return None
+
+
+async def _user_by_email(session, email):
+    result = await session.execute(select(Users).where(Users.email == email).limit(1))
+    return result.scalars().first()
+
+
+async def user_to_dict(session, u):
+    """Async twin of app._user_to_dict (recounts applications, syncs the column)."""
+    start = time.perf_counter()
+    applied_count = await session.scalar(
+        select(func.count()).select_from(Applications).where(Applications.email == u.email)
+    ) or 0
+    if u.applied_count != applied_count:
+        u.applied_count = applied_count
+        await session.commit()
+    function_duration.observe(time.perf_counter() - start, "_user_to_dict")
+    return {
+        "id": u.id,
+        "username": u.username,
+        "email": u.email,
+        "phone": u.phone or "",
+        "org": u.org or "",
+        "profile_pic": u.profile_pic or None,
+        "applied_count": applied_count,
+    }
+
+
+async def send_email_otp(to_email, otp) -> bool:
+    """Async twin of app.send_email_otp: Resend over httpx, SMTP in a thread."""
+    start = time.perf_counter()
+    subject, body_text = backend.otp_email_content(otp)
+    sent = False
+
+    if backend.RESEND_API_KEY:
+        try:
+            resp = await http_client.post(**backend.resend_request(to_email, subject, body_text))
+            if resp.status_code in (200, 201):
+                print(f"[EMAIL] Sent OTP via Resend to {to_email}")
+                sent = True
+            else:
+                print("[EMAIL] Resend API error:", resp.status_code, resp.text)
+        except Exception as e:
+            # same as the Flask twin: anything going wrong falls back to SMTP
+            print("[EMAIL] Exception calling Resend API:", e)
+
+    if not sent and backend.EMAIL_USER and backend.EMAIL_PASS:
+        sent = await asyncio.to_thread(backend.send_via_smtp, to_email, subject, body_text)
+    elif not sent and not backend.RESEND_API_KEY:
+        print("❗ EMAIL ERROR: No RESEND_API_KEY or EMAIL_USER/EMAIL_PASS configured.")
+
+    email_send_duration.observe(time.perf_counter() - start, "sent" if sent else "failed")
+    return sent
+
+
+# ---------------------------
+# /api/auth/*
+# ---------------------------
+async def api_auth_register(request):
+    data = await _json(request)
+    username = (data.get("username") or "").strip()
+    email = (data.get("email") or "").strip().lower()
+    phone = data.get("phone")
+    password = (data.get("password") or "").strip()
+
+    if not username or not email or not password:
+        return _fail("username, email & password required", 400)
+
+    async with Session() as session:
+        if await _user_by_email(session, email):
+            return _fail("Email already exists", 409)
+
+        token_value = str(uuid.uuid4())
+        user = Users(username=username, email=email, phone=phone,
+                     password=await hash_password_async(password), token=token_value)
+        session.add(user)
+        await session.commit()
+
+        return JSONResponse({
+            "success": True,
+            "message": "User registered",
+            "token": token_value,
+            "user": await user_to_dict(session, user),
+        })
+
+
+@rate_limit("api_auth_login", per_ip=LOGIN_PER_IP, per_email=LOGIN_PER_EMAIL)
+async def api_auth_login(request):
+    data = await _json(request)
+    email = (data.get("email") or "").strip().lower()
+    password = (data.get("password") or "").strip()
+
+    if not email or not password:
+        return _fail("email and password required", 400)
+
+    async with Session() as session:
+        user = await _user_by_email(session, email)
+        if not await check_password_async(user, password):
+            return _fail("Invalid credentials", 401)
+
+        token_value = str(uuid.uuid4())
+        user.token = token_value
+        await session.commit()
+
+        return JSONResponse({
+            "success": True,
+            "message": "Login successful",
+            "token": token_value,
+            "user": await user_to_dict(session, user),
+        })
+
+
+# ---------------------------
+# /otp/*
+# ---------------------------
+@rate_limit("otp_register", per_ip=OTP_PER_IP, per_email=OTP_PER_EMAIL)
+async def otp_register_request(request):
+    data = await _json(request)
+    email = (data.get("email") or "").strip().lower()
+
+    if not email:
+        return _fail("Email required", 400)
+
+    async with Session() as session:
+        if await _user_by_email(session, email):
+            return _fail("Email already exists", 409)
+
+    otp = _new_otp(backend.pending_register_otps, email)
+    if not await send_email_otp(email, otp):
+        return _fail("Failed to send email", 500)
+    return JSONResponse({"success": True})
+
+
+@rate_limit("otp_register_verify", per_ip=OTP_VERIFY_PER_IP, per_email=OTP_VERIFY_PER_EMAIL)
+async def otp_register_verify(request):
+    data = await _json(request)
+    email = (data.get("email") or "").strip().lower()
+    otp = (data.get("otp") or "").strip()
+
+    error = _check_otp(backend.pending_register_otps.get(email), otp)
+    if error:
+        return error
+
+    password = data.get("password")
+    if password:
+        password = await hash_password_async(password)
+
+    async with Session() as session:
+        token_value = str(uuid.uuid4())
+        user = Users(
+            username=data.get("username"),
+            email=email,
+            phone=data.get("phone"),
+            password=password,
+            token=token_value,
+        )
+        session.add(user)
+        await session.commit()
+
+        backend.pending_register_otps.pop(email, None)
+        return JSONResponse({
+            "success": True,
+            "token": token_value,
+            "user": await user_to_dict(session, user),
+        })
+
+
+@rate_limit("otp_login", per_ip=OTP_PER_IP, per_email=OTP_PER_EMAIL)
+async def otp_login_request(request):
+    data = await _json(request)
+    email = (data.get("email") or "").strip().lower()
+    password = (data.get("password") or "").strip()
+
+    async with Session() as session:
+        user = await _user_by_email(session, email)
+        if not await check_password_async(user, password):
+            return _fail("Invalid credentials", 401)
+        await session.commit()  # keeps a rehashed / migrated password
+
+    otp = _new_otp(backend.pending_login_otps, email)
+    temp_token = uuid.uuid4().hex
+    backend.login_temp_tokens[temp_token] = email
+
+    await send_email_otp(email, otp)
+    return JSONResponse({"success": True, "tempToken": temp_token})
+
+
+@rate_limit("otp_login_verify", per_ip=OTP_VERIFY_PER_IP, per_email=OTP_VERIFY_PER_EMAIL)
+async def otp_login_verify(request):
+    data = await _json(request)
+    temp = data.get("tempToken")
+    otp = (data.get("otp") or "").strip()
+
+    email = backend.login_temp_tokens.get(temp)
+    if not email:
+        return _fail("Invalid temp token", 400)
+
+    error = _check_otp(backend.pending_login_otps.get(email), otp)
+    if error:
+        return error
+
+    async with Session() as session:
+        user = await _user_by_email(session, email)
+        token_value = str(uuid.uuid4())
+        user.token = token_value
+        await session.commit()
+
+        backend.pending_login_otps.pop(email, None)
+        backend.login_temp_tokens.pop(temp, None)
+        return JSONResponse({
+            "success": True,
+            "token": token_value,
+            "user": await user_to_dict(session, user),
+        })
+
+
+@rate_limit("otp_password", per_ip=OTP_PER_IP, per_email=OTP_PER_EMAIL)
+async def otp_password_request(request):
+    data = await _json(request)
+    email = (data.get("email") or "").strip().lower()
+
+    if not email:
+        return _fail("Email required", 400)
+
+    async with Session() as session:
+        if not await _user_by_email(session, email):
+            return _fail("No account with this email", 404)
+
+    otp = _new_otp(backend.pending_password_otps, email)
+    if not await send_email_otp(email, otp):
+        return _fail("Failed to send email", 500)
+    return JSONResponse({"success": True})
+
+
+@rate_limit("otp_password_reset", per_ip=OTP_VERIFY_PER_IP, per_email=OTP_VERIFY_PER_EMAIL)
+async def otp_password_reset(request):
+    data = await _json(request)
+    email = (data.get("email") or "").strip().lower()
+    otp = (data.get("otp") or "").strip()
+    new_password = (data.get("new_password") or "").strip()
+
+    if not email or not otp or not new_password:
+        return _fail("Missing fields", 400)
+
+    error = _check_otp(backend.pending_password_otps.get(email), otp)
+    if error:
+        return error
+
+    async with Session() as session:
+        user = await _user_by_email(session, email)
+        if not user:
+            return _fail("User not found", 404)
+        user.password = await hash_password_async(new_password)
+        await session.commit()
+
+    backend.pending_password_otps.pop(email, None)
+    return JSONResponse({"success": True, "message": "Password updated"})
+
+
+# ---------------------------
+# App
+# ---------------------------
+class RequestTimingMiddleware:
+    """Feeds the async routes into http_request_duration_seconds like the Flask ones."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] not in ASYNC_PATHS:
+            return await self.app(scope, receive, send)
+        start = time.perf_counter()
+        status = {}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_duration.observe(
+                time.perf_counter() - start, scope["method"], scope["path"],
+                str(status.get("code", 500)),
+            )
+
+
+ASYNC_ROUTES = [
+    Route("/api/auth/register", api_auth_register, methods=["POST"]),
+    Route("/api/auth/login", api_auth_login, methods=["POST"]),
+    Route("/otp/register/request", otp_register_request, methods=["POST"]),
+    Route("/otp/register/verify", otp_register_verify, methods=["POST"]),
+    Route("/otp/login/request", otp_login_request, methods=["POST"]),
+    Route("/otp/login/verify", otp_login_verify, methods=["POST"]),
+    Route("/otp/password/request", otp_password_request, methods=["POST"]),
+    Route("/otp/password/reset", otp_password_reset, methods=["POST"]),
+]
+ASYNC_PATHS = {route.path for route in ASYNC_ROUTES}
+
+
+def create_asgi_app(flask_app=None):
+    flask_app = flask_app or backend.create_app()
+
+    @asynccontextmanager
+    async def lifespan(_app):
+        global http_client
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=50)
+        )
+        try:
+            yield
+        finally:
+            await http_client.aclose()
+            await engine.dispose()
+
+    asgi_app = Starlette(
+        routes=ASYNC_ROUTES + [Mount("/", app=WSGIMiddleware(flask_app))],
+        middleware=[
+            Middleware(RequestTimingMiddleware),
+            Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"],
+                       allow_headers=["*"], allow_credentials=True),
+        ],
+        lifespan=lifespan,
+    )
+    # gunicorn.conf.py hooks (cache warming, post-fork dispose) need the Flask app.
+    asgi_app.state.flask_app = flask_app
+    return asgi_app
+
+
+def __getattr__(name):
+    # `uvicorn asgi:app` builds the ASGI app (and the Flask app) on first access.
+    global _asgi_app
+    if name == "app":
+        if _asgi_app is None:
+            _asgi_app = create_asgi_app()
+        return _asgi_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+_asgi_app = None
@@ -0,0 +1,13 @@
+"""
+Backend benchmarks.
+
+Run from the backend/ directory:
+
+    python -m benchmarks.run --sizes 10k,100k --out bench-results.json
+    python -m benchmarks.compare old.json new.json
+
+synthetic.py builds seeded catalogs (internships, users, applications) using
+the same vocabulary as internship_offers_300.csv; run.py times the hot paths
+against the Flask test client, plus the cold-start cost of importing the
+app (checked against an import-time budget), and writes the numbers as JSON.
+"""
@@ -0,0 +1,46 @@
+# backend/benchmarks/compare.py
+"""
+Compare two benchmark result files written by benchmarks.run.
+
+    python -m benchmarks.compare before.json after.json [--metric median_ms]
+
+Prints one line per benchmark present in both files with the change in the
+chosen metric (negative = faster).
+"""
+import json
+import argparse
+
+
+def _load(path):
+    with open(path, encoding="utf-8") as f:
+        report = json.load(f)
+    return {
+        (r["size"], r["benchmark"], r["case"], r["variant"]): r
+        for r in report["results"]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark runs.")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--metric", default="median_ms")
+    args = parser.parse_args()
+
+    before, after = _load(args.before), _load(args.after)
+    for key in sorted(before.keys() & after.keys()):
+        old, new = before[key][args.metric], after[key][args.metric]
+        change = (new - old) / old * 100 if old else 0.0
+        size, bench, case, variant = key
+        print(
+            f"{size:>8}  {bench:<10} {case:<18} {variant:<13}"
+            f" {old:>10.3f} -> {new:>10.3f}  {change:+7.1f}%"
+        )
+
+    for key in sorted(before.keys() ^ after.keys()):
+        side = "before" if key in before else "after"
+        print(f"only in {side}: {' / '.join(map(str, key))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,397 @@
+# backend/benchmarks/run.py
+"""
+Microbenchmarks for the backend hot paths.
+
+    python -m benchmarks.run                          # 10k, all benchmarks
+    python -m benchmarks.run --sizes 10k,100k,1m --repeat 50 --out bench.json
+    python -m benchmarks.run --only search,apply
+    python -m benchmarks.run --only startup --import-budget-ms 60
+
+Benchmarks:
+  search     POST /internships/search for a set of filter combinations, on the
+             SQL path, the mmap index path and the pre-compressed cache path
+  user_dict  _user_to_dict for existing users (includes the applied_count query)
+  apply      POST /apply
+  importer   import_internships.main() on a synthetic CSV of the same size: into
+             an empty DB (csv_plus_index) and again over unchanged data
+             (noop_resync)
+  startup    cold `import app` and create_app() in a fresh interpreter, and
+             what `import app` adds once Flask + SQLAlchemy are loaded
+
+The run fails (exit 1) when `import app` costs more than --import-budget-ms
+(IMPORT_BUDGET_MS, default 60) on top of the framework imports, so a heavy
+module-level import or import-time side effect shows up as a failure rather
+than a slower number.
+
+Synthetic databases and CSVs are cached in benchmarks/.data/ (keyed by size
+and seed); each run works on a temporary copy of the database. app.py binds its database at import time, so every size runs in a
+fresh interpreter. Results are written as JSON; compare two runs with
+`python -m benchmarks.compare`.
+"""
+import io
+import os
+import sys
+import json
+import time
+import random
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+
+from benchmarks.synthetic import build_database, parse_size, write_csv
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+DATA_DIR = os.path.join(BENCH_DIR, ".data")
+
+ALL_BENCHMARKS = ("search", "user_dict", "apply", "importer", "startup")
+
+# case -> (setup, timed statement), each run in a fresh interpreter from
+# backend/. app_over_framework is what app.py itself adds on top of the
+# Flask / SQLAlchemy imports every worker pays anyway.
+STARTUP_CASES = {
+    "import_app": ("", "import app"),
+    "app_over_framework": ("import flask, flask_cors, flask_sqlalchemy", "import app"),
+    "create_app": ("import app", "app.create_app()"),
+}
+IMPORT_BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "60"))
+
+SEARCH_CASES = {
+    "no_filters": {},
+    "domain": {"domain": "Data Science"},
+    "domain_list": {"domain": ["Data Science", "Web Development"]},
+    "skill": {"skill": "python"},
+    "skill_list": {"skill": ["python", "sql", "react"]},
+    "location_mode": {"location": "remote", "mode": "remote"},
+    "domain_skill_paid": {"domain": "data", "skill": ["python"], "paid": "yes"},
+    "all_filters_full": {
+        "domain": "cloud", "skill": "docker", "location": "bengaluru",
+        "mode": "onsite", "paid": "yes", "fields": "full",
+    },
+    "deep_page": {"skill": "python", "page": 50},
+}
+
+
+def summarize(samples):
+    samples = sorted(samples)
+    mean = statistics.fmean(samples)
+    return {
+        "n": len(samples),
+        "min_ms": round(samples[0] * 1000, 4),
+        "median_ms": round(statistics.median(samples) * 1000, 4),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))] * 1000, 4),
+        "mean_ms": round(mean * 1000, 4),
+        "ops_per_sec": round(1 / mean, 2) if mean else None,
+    }
+
+
+def measure(fn, repeat, warmup=2, setup=None):
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    samples = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples)
+
+
+def ensure_database(size, seed):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"catalog-{size}-{seed}.db")
+    if not os.path.exists(path):
+        print(f"  generating {path} ...", file=sys.stderr)
+        build_database(path, size, seed)
+    return path
+
+
+def ensure_csv(size, seed):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    path = os.path.join(DATA_DIR, f"offers-{size}-{seed}.csv")
+    if not os.path.exists(path):
+        write_csv(path, size, seed)
+    return path
+
+
+# ---------------------------
+# Benchmarks (run inside the per-size child process)
+# ---------------------------
+def bench_search(backend, client, repeat):
+    import serialization
+    from catalog_index import load_index
+
+    index = load_index()
+    variants = {
+        "sql": (None, True),
+        "index": (index, True),
+        "index_cached": (index, False),
+    }
+    results = []
+    for variant, (use_index, clear_cache) in variants.items():
+        if variant != "sql" and index is None:
+            continue
+        backend._catalog_index = use_index
+        backend._catalog_index_loaded = True
+        backend._catalog_index_next_check = float("inf")  # keep this variant's index
+        for case, body in SEARCH_CASES.items():
+            stats = measure(
+                lambda: client.post("/internships/search", json=body),
+                repeat,
+                setup=serialization.catalog_cache.clear if clear_cache else None,
+            )
+            results.append({"benchmark": "search", "case": case, "variant": variant, **stats})
+    backend._catalog_index_loaded = False
+    backend._catalog_index_next_check = 0.0
+    return results
+
+
+def bench_user_dict(backend, client, repeat):
+    from models import Users
+
+    with backend.app.app_context():
+        sample = Users.query.order_by(Users.id).limit(50).all()
+        rng = random.Random(0)
+        stats = measure(lambda: backend._user_to_dict(rng.choice(sample)), repeat)
+    return [{"benchmark": "user_dict", "case": "existing_user", "variant": "orm", **stats}]
+
+
+def bench_apply(backend, client, repeat, size):
+    from models import Users
+
+    with backend.app.app_context():
+        emails = [u.email for u in Users.query.order_by(Users.id).limit(200)]
+    rng = random.Random(1)
+
+    def apply_once():
+        client.post(
+            "/apply",
+            json={
+                "internship_id": rng.randint(1, size),
+                "name": "Bench User",
+                "email": rng.choice(emails),
+                "country": "India",
+                "age": 21,
+                "college_name": "Anna University",
+            },
+        )
+
+    stats = measure(apply_once, repeat)
+    return [{"benchmark": "apply", "case": "known_user", "variant": "orm", **stats}]
+
+
+def bench_importer(size, seed, repeat):
+    import import_internships
+
+    csv_path = ensure_csv(size, seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        import_internships.CSV_PATH = csv_path
+        import_internships.DB_PATH = os.path.join(tmp, "import.db")
+        import_internships.INDEX_PATH = os.path.join(tmp, "import.idx")
+        import_internships.DEDUP_REPORT_PATH = os.path.join(tmp, "dedup_report.json")
+
+        def fresh_db():
+            for path in (import_internships.DB_PATH, import_internships.INDEX_PATH):
+                if os.path.exists(path):
+                    os.remove(path)
+
+        runs = max(1, min(repeat, 3))
+        with redirect_stdout(io.StringIO()):
+            # the importer syncs, so only a run on an empty DB inserts the catalog
+            cold = measure(import_internships.main, runs, warmup=0, setup=fresh_db)
+            # DB already matches the CSV: diff finds nothing, index is rewritten
+            resync = measure(import_internships.main, runs, warmup=0)
+    return [
+        {"benchmark": "importer", "case": "csv_plus_index", "variant": "sqlite3", **cold},
+        {"benchmark": "importer", "case": "noop_resync", "variant": "sqlite3", **resync},
+    ]
+
+
+def _startup_seconds(setup, stmt):
+    code = (
+        f"import time\n{setup}\nstart = time.perf_counter()\n{stmt}\n"
+        "print(time.perf_counter() - start)"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_DIR, check=True, capture_output=True, text=True
+    )
+    return float(out.stdout.split()[-1])
+
+
+def bench_startup(repeat):
+    # Cases are interleaved so machine load drifts over all of them alike.
+    samples = {case: [] for case in STARTUP_CASES}
+    for _ in range(max(5, min(repeat, 20))):
+        for case, (setup, stmt) in STARTUP_CASES.items():
+            samples[case].append(_startup_seconds(setup, stmt))
+    return [
+        {"benchmark": "startup", "case": case, "variant": "subprocess", **summarize(times)}
+        for case, times in samples.items()
+    ]
+
+
+def check_import_budget(results, budget_ms):
+    """
+    Messages for each size where `import app` adds more than `budget_ms` to
+    the framework imports. Compares minimums: machine noise only adds time.
+    """
+    failures = []
+    for r in results:
+        if r["benchmark"] == "startup" and r["case"] == "app_over_framework" and r["min_ms"] > budget_ms:
+            failures.append(
+                f"import app costs {r['min_ms']:.1f} ms over the framework imports "
+                f"(budget {budget_ms:.0f} ms, size {r['size']})"
+            )
+    return failures
+
+
+def run_child(size, seed, repeat, only):
+    with tempfile.TemporaryDirectory() as tmp:
+        return _run_child(size, seed, repeat, only, tmp)
+
+
+def _run_child(size, seed, repeat, only, workdir):
+    import sqlite3
+    import import_internships
+
+    cached = ensure_database(size, seed)
+    index_path = f"{cached}.idx"
+    if "search" in only and not os.path.exists(index_path):
+        import_internships.INDEX_PATH = index_path
+        conn = sqlite3.connect(cached)
+        with redirect_stdout(io.StringIO()):
+            import_internships.write_catalog_index(conn.cursor())
+        conn.close()
+
+    # /apply writes, so every run starts from its own copy of the cached DB;
+    # the catalog index is read-only and stays next to the cached one.
+    db_path = os.path.join(workdir, "bench.db")
+    src, dst = sqlite3.connect(cached), sqlite3.connect(db_path)
+    src.backup(dst)
+    src.close()
+    dst.close()
+    os.environ["DATABASE_PATH"] = db_path
+    os.environ["CATALOG_INDEX_PATH"] = index_path
+    import_internships.INDEX_PATH = index_path
+
+    with redirect_stdout(io.StringIO()):
+        import app as backend
+
+        # cached databases may predate newer tables, and migrate rolls the
+        # generated applications into the stats tables, so /apply is timed on
+        # its steady-state path rather than the catch-up one
+        backend.migrate(backend.app)
+    client = backend.app.test_client()
+
+    results = []
+    if "search" in only:
+        results += bench_search(backend, client, repeat)
+    if "user_dict" in only:
+        results += bench_user_dict(backend, client, repeat)
+    if "apply" in only:
+        results += bench_apply(backend, client, repeat, size)
+    if "importer" in only:
+        results += bench_importer(size, seed, repeat)
+    if "startup" in only:
+        results += bench_startup(repeat)
+    for r in results:
+        r["size"] = size
+    return results
+
+
+# ---------------------------
+# Driver
+# ---------------------------
+def _git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=BACKEND_DIR, capture_output=True, text=True, timeout=5,
+        )
+        return out.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def print_table(results):
+    for r in results:
+        label = f"{r['size']:>8}  {r['benchmark']:<10} {r['case']:<18} {r['variant']:<13}"
+        print(f"{label} median {r['median_ms']:>10.3f} ms   p95 {r['p95_ms']:>10.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run backend microbenchmarks.")
+    parser.add_argument("--sizes", default="10k", help="comma list of 10k, 100k, 1m or numbers")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=30)
+    parser.add_argument("--only", default=",".join(ALL_BENCHMARKS))
+    parser.add_argument("--out", default="bench-results.json")
+    parser.add_argument("--import-budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--child-size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--child-out", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    only = [b.strip() for b in args.only.split(",") if b.strip()]
+    unknown = set(only) - set(ALL_BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    if args.child_size:
+        results = run_child(args.child_size, args.seed, args.repeat, only)
+        with open(args.child_out, "w", encoding="utf-8") as f:
+            json.dump(results, f)
+        return
+
+    results = []
+    for size in (parse_size(s) for s in args.sizes.split(",")):
+        print(f"▶ size {size}", file=sys.stderr)
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
+            child_out = tmp.name
+        try:
+            subprocess.run(
+                [
+                    sys.executable, "-m", "benchmarks.run",
+                    "--child-size", str(size), "--child-out", child_out,
+                    "--seed", str(args.seed), "--repeat", str(args.repeat),
+                    "--only", ",".join(only),
+                ],
+                cwd=BACKEND_DIR, check=True,
+            )
+            with open(child_out, encoding="utf-8") as f:
+                size_results = json.load(f)
+        finally:
+            os.remove(child_out)
+        print_table(size_results)
+        results += size_results
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"✅ wrote {len(results)} results to {args.out}")
+
+    failures = check_import_budget(results, args.import_budget_ms)
+    for message in failures:
+        print(f"❗ {message}", file=sys.stderr)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# backend/benchmarks/synthetic.py
+"""
+Seeded synthetic catalog generator.
+
+Vocabulary (companies, domains, per-domain skills/roles/prerequisites,
+locations, modes, durations, perks) is taken from internship_offers_300.csv,
+so generated rows look like real postings and exercise the same search
+filters. The same (size, seed) always produces the same data.
+
+    python -m benchmarks.synthetic --size 100k --db /tmp/catalog-100k.db
+    python -m benchmarks.synthetic --size 10k --csv /tmp/offers-10k.csv
+"""
+import os
+import csv
+import random
+import sqlite3
+import argparse
+from collections import defaultdict
+
+from sqlalchemy import create_engine
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_CSV = os.path.join(BACKEND_DIR, "internship_offers_300.csv")
+
+CSV_COLUMNS = [
+    "name", "domains", "skills", "paid", "duration", "role",
+    "location", "mode", "prerequisites", "stipend", "other",
+]
+
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+BATCH = 10_000
+
+FIRST_NAMES = ["Aarav", "Diya", "Ishaan", "Kavya", "Rohan", "Sneha", "Arjun", "Meera", "Vikram", "Ananya"]
+COUNTRIES = ["India", "India", "India", "Sri Lanka", "Nepal", "Bangladesh", "UAE"]
+COLLEGES = [
+    "Anna University", "PSG College of Technology", "IIT Madras", "NIT Trichy",
+    "VIT Vellore", "SRM Institute", "Amrita Vishwa Vidyapeetham", "BITS Pilani",
+]
+
+
+def parse_size(value) -> int:
+    value = str(value).strip().lower()
+    return SIZES.get(value) or int(value.replace("_", ""))
+
+
+class Vocabulary:
+    """Distinct values from the source CSV, grouped by domain where it matters."""
+
+    def __init__(self, path=SOURCE_CSV):
+        with open(path, newline="", encoding="utf-8") as f:
+            rows = list(csv.DictReader(f))
+
+        self.companies = sorted({r["name"] for r in rows})
+        self.locations = sorted({r["location"] for r in rows})
+        self.modes = sorted({r["mode"] for r in rows})
+        self.durations = sorted({r["duration"] for r in rows})
+        self.others = sorted({r["other"] for r in rows})
+
+        skills = defaultdict(set)
+        roles = defaultdict(set)
+        prerequisites = defaultdict(set)
+        for r in rows:
+            for domain in (d.strip() for d in r["domains"].split(",")):
+                skills[domain].update(s.strip() for s in r["skills"].split(","))
+                roles[domain].add(r["role"])
+                prerequisites[domain].add(r["prerequisites"])
+        self.domains = sorted(skills)
+        self.skills = {d: sorted(v) for d, v in skills.items()}
+        self.roles = {d: sorted(v) for d, v in roles.items()}
+        self.prerequisites = {d: sorted(v) for d, v in prerequisites.items()}
+
+
+def internships(size, seed=42, vocab=None):
+    """Yield `size` internship dicts with CSV_COLUMNS keys."""
+    vocab = vocab or Vocabulary()
+    rng = random.Random(seed)
+    for _ in range(size):
+        domain = rng.choice(vocab.domains)
+        pool = vocab.skills[domain]
+        skills = rng.sample(pool, min(len(pool), rng.randint(3, 5)))
+        paid = rng.random() < 0.8
+        yield {
+            "name": rng.choice(vocab.companies),
+            "domains": domain,
+            "skills": ", ".join(skills),
+            "paid": "Yes" if paid else "No",
+            "duration": rng.choice(vocab.durations),
+            "role": rng.choice(vocab.roles[domain]),
+            "location": rng.choice(vocab.locations),
+            "mode": rng.choice(vocab.modes),
+            "prerequisites": rng.choice(vocab.prerequisites[domain]),
+            "stipend": f"₹{rng.randint(3000, 30000) if paid else 0} /month",
+            "other": rng.choice(vocab.others),
+        }
+
+
+def users(count, seed=42):
+    rng = random.Random(seed + 1)
+    for i in range(count):
+        first = rng.choice(FIRST_NAMES)
+        yield {
+            "username": f"{first} {i}",
+            "email": f"{first.lower()}.{i}@example.com",
+            "phone": f"9{rng.randint(100000000, 999999999)}",
+            "password": f"password{i}",
+            "org": rng.choice(COLLEGES),
+            "applied_count": 0,
+        }
+
+
+def applications(count, internship_count, user_emails, seed=42):
+    """Applications from existing users (80%) and anonymous applicants (20%)."""
+    rng = random.Random(seed + 2)
+    for i in range(count):
+        if user_emails and rng.random() < 0.8:
+            email = rng.choice(user_emails)
+            name = email.split("@")[0].replace(".", " ").title()
+        else:
+            name = f"{rng.choice(FIRST_NAMES)} Applicant {i}"
+            email = f"applicant.{i}@example.org"
+        yield {
+            "internship_id": rng.randint(1, internship_count),
+            "name": name,
+            "email": email,
+            "country": rng.choice(COUNTRIES),
+            "age": rng.randint(18, 26),
+            "college_name": rng.choice(COLLEGES),
+        }
+
+
+def _batched(rows, size=BATCH):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def write_csv(path, size, seed=42):
+    """Write a CSV in the importer's format (same header as the source file)."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS)
+        writer.writeheader()
+        for batch in _batched(internships(size, seed)):
+            writer.writerows(batch)
+    return path
+
+
+def build_database(path, size, seed=42, user_count=None, application_count=None):
+    """
+    Create a fresh SQLite database at `path` with the app's schema and
+    `size` internships plus users and applications. Returns the row counts.
+    """
+    from models import db  # schema only; no Flask app needed
+
+    user_count = max(100, size // 10) if user_count is None else user_count
+    application_count = size if application_count is None else application_count
+
+    if os.path.exists(path):
+        os.remove(path)
+    db.metadata.create_all(create_engine(f"sqlite:///{path}"))
+
+    conn = sqlite3.connect(path)
+    cur = conn.cursor()
+    cur.execute("PRAGMA journal_mode=OFF")
+    cur.execute("PRAGMA synchronous=OFF")
+
+    for batch in _batched(internships(size, seed)):
+        cur.executemany(
+            f"INSERT INTO internships ({', '.join(CSV_COLUMNS)}) "
+            f"VALUES ({', '.join('?' * len(CSV_COLUMNS))})",
+            [tuple(r[c] for c in CSV_COLUMNS) for r in batch],
+        )
+
+    user_emails = []
+    for batch in _batched(users(user_count, seed)):
+        cur.executemany(
+            "INSERT INTO users (username, email, phone, password, org, applied_count) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [(u["username"], u["email"], u["phone"], u["password"], u["org"], 0) for u in batch],
+        )
+        user_emails.extend(u["email"] for u in batch)
+
+    app_columns = ("internship_id", "name", "email", "country", "age", "college_name")
+    for batch in _batched(applications(application_count, size, user_emails, seed)):
+        cur.executemany(
+            f"INSERT INTO applications ({', '.join(app_columns)}) "
+            f"VALUES ({', '.join('?' * len(app_columns))})",
+            [tuple(a[c] for c in app_columns) for a in batch],
+        )
+
+    conn.commit()
+    conn.close()
+    return {"internships": size, "users": user_count, "applications": application_count}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic internship catalog.")
+    parser.add_argument("--size", default="10k", help="10k, 100k, 1m or a number")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--db", help="write a SQLite database here")
+    parser.add_argument("--csv", help="write an importer-compatible CSV here")
+    args = parser.parse_args()
+
+    size = parse_size(args.size)
+    if not args.db and not args.csv:
+        parser.error("pass --db and/or --csv")
+    if args.db:
+        print(f"📦 {build_database(args.db, size, args.seed)} -> {args.db}")
+    if args.csv:
+        write_csv(args.csv, size, args.seed)
+        print(f"📄 {size} internships -> {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+# backend/catalog_index.py
+"""
+Prebuilt catalog index shared by every worker through mmap.
+
+import_internships.py writes the file once after each import (to a temp file,
+then renamed over the old one); app.py maps it read-only, so all gunicorn
+workers share the same page-cache pages and serve internships as slices of
+pre-serialized JSON instead of querying SQLite and re-serializing rows on
+every request. Workers notice a new file by its `index_stamp` and remap it.
+
+File layout (little-endian, sections aligned to 8 bytes):
+
+    MAGIC | u32 header length | header JSON | ids | stipends | postings
+          | offsets | blob | card_offsets | card_blob
+
+  - ids           int32[count]      internship ids, ascending
+  - stipends      int32[count]      numeric stipend per record (0 when unknown)
+  - postings      int32[...]        record positions, grouped per (column, value)
+  - offsets       uint64[count + 1] start of each full record in blob
+  - blob          compact JSON objects with INTERNSHIP_FIELDS, back to back
+  - card_offsets  uint64[count + 1] start of each card record in card_blob
+  - card_blob     compact JSON objects with CARD_FIELDS, back to back
+
+The header holds the section table, the internship_changes version the
+snapshot was taken at and, per filterable column, the distinct lower-cased
+values with the slice of `postings` listing the records that carry that
+value.
+"""
+import os
+import re
+import sys
+import json
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INDEX_PATH = os.getenv("CATALOG_INDEX_PATH", os.path.join(BASE_DIR, "catalog.idx"))
+
+MAGIC = b"ICIDX002"
+_HEADER_LEN = struct.Struct("<I")
+
+# Full internship record, in response order (see app.internship_to_dict).
+INTERNSHIP_FIELDS = (
+    "id", "name", "domains", "skills", "paid", "duration", "role",
+    "location", "mode", "prerequisites", "stipend", "other",
+)
+
+# Compact projection used by list views.
+CARD_FIELDS = ("id", "name", "role", "location", "stipend")
+
+# Pre-serialized projections and the section names holding them.
+VIEWS = {
+    "full": ("offsets", "blob", INTERNSHIP_FIELDS),
+    "card": ("card_offsets", "card_blob", CARD_FIELDS),
+}
+
+# Columns the search endpoint filters on with case-insensitive substring match.
+POSTING_COLUMNS = ("domains", "skills", "location", "mode", "paid")
+
+_DIGITS = re.compile(r"\d+")
+
+
+def parse_stipend(value) -> int:
+    """'₹23674 /month' -> 23674, anything without digits -> 0."""
+    if not value:
+        return 0
+    m = _DIGITS.search(str(value).replace(",", ""))
+    return int(m.group()) if m else 0
+
+
+def _typed(code, values):
+    arr = array(code, values)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _pad(buf: bytearray):
+    buf.extend(b"\0" * (-len(buf) % 8))
+
+
+def write_index(records, path=INDEX_PATH, version=None):
+    """
+    Write the index for `records` (dicts shaped like app.internship_to_dict).
+    `version` is the internship_changes version the records reflect; the
+    delta feed doesn't hand out changes past it while this file is served.
+
+    The file is written next to `path` and renamed over it, so workers that
+    still map the previous file keep reading a consistent snapshot.
+    """
+    records = sorted(records, key=lambda r: r["id"])
+
+    blobs = {view: bytearray() for view in VIEWS}
+    offsets = {view: [0] for view in VIEWS}
+    postings_by_column = {c: {} for c in POSTING_COLUMNS}
+    for pos, rec in enumerate(records):
+        for view, (_, _, fields) in VIEWS.items():
+            projected = {f: rec.get(f) for f in fields}
+            blobs[view] += json.dumps(
+                projected, ensure_ascii=False, separators=(",", ":")
+            ).encode("utf-8")
+            offsets[view].append(len(blobs[view]))
+        for col in POSTING_COLUMNS:
+            value = (rec.get(col) or "").lower()
+            if value:
+                postings_by_column[col].setdefault(value, []).append(pos)
+
+    postings = []
+    vocab = {}
+    for col, values in postings_by_column.items():
+        vocab[col] = []
+        for value, positions in values.items():
+            vocab[col].append([value, len(postings), len(positions)])
+            postings.extend(positions)
+
+    sections = [
+        ("ids", _typed("i", [r["id"] for r in records])),
+        ("stipends", _typed("i", [parse_stipend(r.get("stipend")) for r in records])),
+        ("postings", _typed("i", postings)),
+    ]
+    for view, (offsets_name, blob_name, _) in VIEWS.items():
+        sections.append((offsets_name, _typed("Q", offsets[view])))
+        sections.append((blob_name, bytes(blobs[view])))
+
+    # The header stores absolute section offsets, which depend on the header's
+    # own length; size it with oversized placeholders first, then fill them in.
+    table = {name: [10 ** 15, len(data)] for name, data in sections}
+    header = {"count": len(records), "version": version, "sections": table, "vocab": vocab}
+    start = len(MAGIC) + _HEADER_LEN.size + len(json.dumps(header).encode("utf-8"))
+    start += -start % 8
+    for name, data in sections:
+        table[name][0] = start
+        start += len(data) + (-len(data) % 8)
+    header_bytes = json.dumps(header).encode("utf-8")
+
+    out = bytearray(MAGIC)
+    out += _HEADER_LEN.pack(len(header_bytes))
+    out += header_bytes
+    for name, data in sections:
+        out.extend(b"\0" * (table[name][0] - len(out)))
+        out += data
+        _pad(out)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(out)
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+def _stamp(st):
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def index_stamp(path=INDEX_PATH):
+    """(inode, mtime, size) of the file at `path`, or None when it is missing."""
+    try:
+        return _stamp(os.stat(path))
+    except OSError:
+        return None
+
+
+class CatalogIndex:
+    """Read-only view over an index file written by `write_index`."""
+
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        with open(path, "rb") as f:
+            self.stamp = _stamp(os.fstat(f.fileno()))
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buf = memoryview(self._mm)
+        if bytes(buf[: len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a catalog index for this version; re-run the importer")
+        (header_len,) = _HEADER_LEN.unpack_from(buf, len(MAGIC))
+        header_start = len(MAGIC) + _HEADER_LEN.size
+        header = json.loads(bytes(buf[header_start: header_start + header_len]))
+
+        def section(name, code=None):
+            off, size = header["sections"][name]
+            view = buf[off: off + size]
+            return view.cast(code) if code else view
+
+        self.count = header["count"]
+        self._ids = section("ids", "i")
+        self._stipends = section("stipends", "i")
+        self._postings = section("postings", "i")
+        self._views = {
+            view: (section(offsets_name, "Q"), section(blob_name))
+            for view, (offsets_name, blob_name, _) in VIEWS.items()
+        }
+        self._vocab = header["vocab"]
+        self.version = header.get("version")  # None: written before versions existed
+
+    def __len__(self):
+        return self.count
+
+    def position(self, internship_id):
+        """Record position for an internship id, or None."""
+        pos = bisect_left(self._ids, internship_id)
+        if pos < self.count and self._ids[pos] == internship_id:
+            return pos
+        return None
+
+    def record(self, pos, view="full") -> memoryview:
+        """Pre-serialized JSON object for the record at `pos` (no copy)."""
+        offsets, blob = self._views[view]
+        return blob[offsets[pos]: offsets[pos + 1]]
+
+    def stipend(self, pos) -> int:
+        return self._stipends[pos]
+
+    def get(self, internship_id, view="full"):
+        pos = self.position(internship_id)
+        return None if pos is None else self.record(pos, view)
+
+    def matching(self, column, needle):
+        """
+        Positions whose `column` contains `needle`, case-insensitively.
+
+        Mirrors `func.lower(column).like('%needle%')`: the needle is matched
+        against each distinct column value, then their postings are unioned.
+        """
+        needle = needle.lower()
+        found = set()
+        for value, start, size in self._vocab.get(column, ()):
+            if needle in value:
+                found.update(self._postings[start: start + size])
+        return found
+
+    def search(self, filters):
+        """
+        Record positions matching `filters`, in id order.
+
+        `filters` maps a column to a string or a list of strings; a list
+        matches when any of its entries does (same as the SQL path).
+        """
+        selected = None
+        for column, wanted in filters.items():
+            if not wanted:
+                continue
+            needles = wanted if isinstance(wanted, list) else [wanted]
+            hits = set()
+            for needle in needles:
+                hits |= self.matching(column, needle)
+            selected = hits if selected is None else selected & hits
+        if selected is None:
+            return range(self.count)
+        return sorted(selected)
+
+    def json_array(self, positions, view="full"):
+        """Chunks forming a JSON array of the given records."""
+        chunks = [b"["]
+        for n, pos in enumerate(positions):
+            if n:
+                chunks.append(b",")
+            chunks.append(self.record(pos, view))
+        chunks.append(b"]")
+        return chunks
+
+
+def load_index(path=INDEX_PATH):
+    """Map the index at `path`, or return None when it is missing or unreadable."""
+    if not os.path.exists(path):
+        return None
+    try:
+        return CatalogIndex(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"WARN: ignoring catalog index {path}: {e}")
+        return None
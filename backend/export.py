@@ -0,0 +1,251 @@
+# backend/export.py
+"""
+Bulk export of the catalog and applications as CSV, NDJSON, Parquet or
+Arrow IPC (the last two need `pip install pyarrow`).
+
+Rows are read in EXPORT_CHUNK_ROWS partitions from a streaming cursor and
+each partition is encoded and sent as it arrives, so memory stays at one
+chunk regardless of table size and the first bytes go out immediately.
+
+HTTP (Bearer EXPORT_TOKEN when set; applications need it, they hold PII):
+  GET /export/internships?format=csv|ndjson|parquet|arrow
+  GET /export/applications?format=...
+CSV/NDJSON are gzip/brotli encoded on the fly when the client accepts it.
+
+CLI, for analytics jobs (reads the DB directly, no web worker involved):
+  python export.py internships --format parquet --out internships.parquet
+"""
+import io
+import os
+import csv
+import json
+import zlib
+import importlib.util
+
+from flask import Response, abort, jsonify, request
+from sqlalchemy import select
+
+from models import db, Internships, Applications
+from catalog_index import INTERNSHIP_FIELDS
+# orjson / brotli are optional; serialization sets them to None when missing
+from serialization import brotli, negotiate_encoding, orjson
+
+# Optional, enables parquet / arrow. Found at import but only loaded by the
+# first Arrow export: pyarrow costs more to import than the rest of the app.
+HAVE_PYARROW = importlib.util.find_spec("pyarrow") is not None
+
+EXPORT_TOKEN = os.getenv("EXPORT_TOKEN")
+EXPORT_CHUNK_ROWS = int(os.getenv("EXPORT_CHUNK_ROWS", "2000"))
+
+APPLICATION_FIELDS = ("id", "internship_id", "name", "email", "country", "age", "college_name")
+INTEGER_FIELDS = {"id", "internship_id", "age"}
+
+# name -> (model, columns, public without EXPORT_TOKEN)
+DATASETS = {
+    "internships": (Internships, INTERNSHIP_FIELDS, True),
+    "applications": (Applications, APPLICATION_FIELDS, False),
+}
+
+FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows"),
+}
+ARROW_FORMATS = {"parquet", "arrow"}
+
+
+def available_formats():
+    return [f for f in FORMATS if HAVE_PYARROW or f not in ARROW_FORMATS]
+
+
+def iter_partitions(engine, dataset, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Yield lists of row tuples, `chunk_rows` at a time, ordered by id."""
+    model, fields, _ = DATASETS[dataset]
+    stmt = select(*[getattr(model, f) for f in fields]).order_by(model.id)
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, yield_per=chunk_rows).execute(stmt)
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+
+# ---------------------------
+# Encoders: partitions -> bytes chunks
+# ---------------------------
+def encode_csv(partitions, fields):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(fields)
+    for rows in partitions:
+        writer.writerows(rows)
+        yield buf.getvalue().encode("utf-8")
+        buf.seek(0)
+        buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+def encode_ndjson(partitions, fields):
+    for rows in partitions:
+        if orjson is not None:
+            lines = [orjson.dumps(dict(zip(fields, row))) for row in rows]
+        else:
+            lines = [json.dumps(dict(zip(fields, row)), ensure_ascii=False).encode("utf-8") for row in rows]
+        lines.append(b"")
+        yield b"\n".join(lines)
+
+
+class _Drain:
+    """Write-only file object whose contents are taken after every batch."""
+
+    def __init__(self):
+        self.parts = []
+        self.closed = False
+
+    def write(self, data):
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def take(self):
+        data = b"".join(self.parts)
+        self.parts = []
+        return data
+
+
+def arrow_schema(fields):
+    import pyarrow as pa
+
+    return pa.schema([(f, pa.int64() if f in INTEGER_FIELDS else pa.string()) for f in fields])
+
+
+def _record_batch(rows, schema):
+    import pyarrow as pa
+
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    return pa.record_batch(
+        [pa.array(col, type=field.type) for col, field in zip(columns, schema)], schema=schema
+    )
+
+
+def encode_arrow(partitions, fields, parquet=False):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = arrow_schema(fields)
+    drain = _Drain()
+    sink = pa.PythonFile(drain, mode="w")
+    if parquet:
+        # one row group per partition
+        writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    else:
+        writer = pa.ipc.new_stream(sink, schema)
+    for rows in partitions:
+        writer.write_batch(_record_batch(rows, schema))
+        data = drain.take()
+        if data:
+            yield data
+    writer.close()
+    yield drain.take()
+
+
+def encode(partitions, fields, fmt):
+    if fmt == "csv":
+        return encode_csv(partitions, fields)
+    if fmt == "ndjson":
+        return encode_ndjson(partitions, fields)
+    return encode_arrow(partitions, fields, parquet=fmt == "parquet")
+
+
+def compress_stream(chunks, encoding):
+    """Content-Encode a chunk stream incrementally ('gzip' or 'br')."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=5)
+        for chunk in chunks:
+            out = compressor.process(chunk)
+            if out:
+                yield out
+        yield compressor.finish()
+        return
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # 31 -> gzip container
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+# ---------------------------
+# HTTP endpoint
+# ---------------------------
+def export_endpoint(dataset):
+    if dataset not in DATASETS:
+        abort(404)
+    _, fields, public = DATASETS[dataset]
+    if EXPORT_TOKEN:
+        if request.headers.get("Authorization", "") != f"Bearer {EXPORT_TOKEN}":
+            return jsonify({"success": False, "message": "Unauthorized"}), 401
+    elif not public:
+        return jsonify({"success": False, "message": "Export of this dataset requires EXPORT_TOKEN"}), 403
+
+    fmt = request.args.get("format", "ndjson").lower()
+    if fmt not in available_formats():
+        message = f"format must be one of: {', '.join(available_formats())}"
+        return jsonify({"success": False, "message": message}), 400
+
+    mimetype, extension = FORMATS[fmt]
+    chunks = encode(iter_partitions(db.engine, dataset), fields, fmt)
+    headers = {"Content-Disposition": f'attachment; filename="{dataset}.{extension}"'}
+    encoding = negotiate_encoding() if fmt in ("csv", "ndjson") else None
+    if encoding:
+        chunks = compress_stream(chunks, encoding)
+        headers["Content-Encoding"] = encoding
+        headers["Vary"] = "Accept-Encoding"
+    return Response(chunks, mimetype=mimetype, headers=headers, direct_passthrough=True)
+
+
+def init_export(app):
+    app.add_url_rule("/export/<dataset>", "export", export_endpoint, methods=["GET"])
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+def main():
+    import sys
+    import argparse
+    from sqlalchemy import create_engine
+
+    parser = argparse.ArgumentParser(description="Export a dataset from the backend database.")
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("--format", choices=available_formats(), default="csv")
+    parser.add_argument("--out", help="output file (default: stdout)")
+    parser.add_argument("--chunk-rows", type=int, default=EXPORT_CHUNK_ROWS)
+    args = parser.parse_args()
+
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    db_path = os.getenv("DATABASE_PATH", os.path.join(base_dir, "database.db"))
+    engine = create_engine(f"sqlite:///{db_path}")
+    _, fields, _ = DATASETS[args.dataset]
+    chunks = encode(iter_partitions(engine, args.dataset, args.chunk_rows), fields, args.format)
+
+    out = open(args.out, "wb") if args.out else sys.stdout.buffer
+    written = 0
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if args.out:
+            out.close()
+    if args.out:
+        print(f"✅ Exported {args.dataset} as {args.format} ({written} bytes): {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# backend/gunicorn.conf.py
+"""
+Production gunicorn settings. gunicorn reads this file automatically when
+started from backend/:
+
+    gunicorn                      # same as: gunicorn -c gunicorn.conf.py
+
+Environment knobs:
+  PORT / GUNICORN_BIND      listen address (Render sets PORT)
+  WEB_CONCURRENCY           worker processes (default 2 x CPUs + 1)
+  GUNICORN_WORKER_CLASS     sync | gthread | gevent (gevent suits the
+                            email-bound OTP endpoints; needs `pip install gevent`)
+                            | uvicorn.workers.UvicornWorker (serves asgi.py:
+                            async OTP/auth routes, Flask for the rest)
+  GUNICORN_THREADS          threads per worker for gthread (default 4)
+  GUNICORN_PRELOAD          1 (default) builds the app and warms caches once
+                            in the master; workers share it copy-on-write
+  GUNICORN_MIGRATE          1 (default) creates missing tables/indexes once in
+                            the master before workers start (the app itself
+                            no longer does it on import; see app.migrate)
+  GUNICORN_TIMEOUT, GUNICORN_MAX_REQUESTS
+"""
+import os
+import multiprocessing
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "sync")
+
+if worker_class == "gevent":
+    # Patch before the app (and requests/ssl) is imported by the preload.
+    from gevent import monkey
+
+    monkey.patch_all()
+
+if "uvicorn" in worker_class:
+    wsgi_app = "asgi:create_asgi_app()"
+else:
+    wsgi_app = "app:create_app()"
+
+bind = os.getenv("GUNICORN_BIND", f"0.0.0.0:{os.getenv('PORT', '5000')}")
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.getenv("GUNICORN_THREADS", "4" if worker_class == "gthread" else "1"))
+if worker_class == "gevent":
+    worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", "1000"))
+
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") != "0"
+migrate_on_start = os.getenv("GUNICORN_MIGRATE", "1") != "0"
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers now and then so slow leaks can't accumulate.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = max_requests // 10 if max_requests else 0
+
+accesslog = os.getenv("GUNICORN_ACCESSLOG")  # e.g. "-" for stdout
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOGLEVEL", "info")
+
+
+def _flask_app(obj):
+    # gunicorn hands out its Application wrapper; the Flask app is its callable
+    # (or hangs off the Starlette app's state when serving asgi.py).
+    app = getattr(obj, "callable", None) or getattr(obj, "wsgi", None)
+    state = getattr(app, "state", None)
+    return getattr(state, "flask_app", None) or app
+
+
+def when_ready(server):
+    """
+    Master, before any worker is spawned: bring the schema up to date, then
+    (after preload) warm caches so workers fork with them in memory.
+    """
+    if migrate_on_start:
+        from app import create_app, migrate
+
+        migrate(_flask_app(server.app) if preload_app else create_app())
+        server.log.info("database schema up to date")
+    if not preload_app:
+        return
+    from app import warm_caches
+
+    warm_caches(_flask_app(server.app))
+    server.log.info("catalog caches warmed in master")
+
+
+def post_fork(server, worker):
+    """
+    Worker, right after fork: drop pooled DB connections inherited from the
+    master (close=False leaves the parent's sockets/file handles alone).
+    """
+    if not preload_app:
+        return
+    from models import db
+
+    flask_app = _flask_app(server.app)
+    with flask_app.app_context():
+        db.engine.dispose(close=False)
+
+
+def post_worker_init(worker):
+    """Without preload each worker builds its own app; warm it here instead."""
+    if preload_app:
+        return
+    from app import warm_caches
+
+    warm_caches(_flask_app(worker))
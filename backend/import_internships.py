@@ -1,16 +1,34 @@
 import os
 import sqlite3
 import csv
+import json
+import random
+import hashlib
+from collections import defaultdict
+
+from catalog_index import INDEX_PATH, parse_stipend, write_index
 
 # ---------------------------------------------------------
 # 1) Locate the SAME database used by app.py
 # ---------------------------------------------------------
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-DB_PATH = os.path.join(BASE_DIR, "database.db")
+DB_PATH = os.getenv("DATABASE_PATH", os.path.join(BASE_DIR, "database.db"))
 
 # Optional CSV file (if you ever want to use one)
 CSV_PATH = os.path.join(BASE_DIR, "internship_offers_300.csv")
 
+# Near-duplicate handling for CSV rows (see dedup_rows below)
+#   keep-first one row per cluster, the others dropped (default)
+#   merge      one row per cluster: the first row's text with every location
+#              and mode in the cluster and its highest stipend. Not a real
+#              posting (stipend may be another city's), so opt-in only.
+#   report     insert everything, only write the report
+#   off        skip the stage
+# Either way, applications to a dropped row are moved to the kept one.
+DEDUP_POLICY = os.getenv("DEDUP_POLICY", "keep-first")
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+DEDUP_REPORT_PATH = os.getenv("DEDUP_REPORT_PATH", os.path.join(BASE_DIR, "dedup_report.json"))
+
 
 def ensure_table(cursor):
   """Create internships table if it does not exist."""
@@ -30,6 +48,280 @@ def ensure_table(cursor):
         other TEXT
     )
   """)
+  # Read by /internships/changes; one row (the latest) per internship
+  cursor.execute("""
+    CREATE TABLE IF NOT EXISTS internship_changes (
+        version INTEGER PRIMARY KEY AUTOINCREMENT,
+        internship_id INTEGER NOT NULL,
+        op VARCHAR(10) NOT NULL
+    )
+  """)
+  cursor.execute("""
+    CREATE INDEX IF NOT EXISTS ix_internship_changes_internship_id
+    ON internship_changes (internship_id)
+  """)
+
+
+# ---------------------------------------------------------
+# 2) Sync rows into the table + change log
+# ---------------------------------------------------------
+# Instead of wiping the table, rows are matched to the existing ones by a
+# natural key (company, role, skill set), so ids stay stable across imports
+# and only real changes are written and logged for /internships/changes.
+FIELDS = (
+  "name", "domains", "skills", "paid", "duration", "role",
+  "location", "mode", "prerequisites", "stipend", "other",
+)
+
+
+def natural_key(row):
+  skills = sorted({_norm(s) for s in (row.get("skills") or "").split(",") if _norm(s)})
+  return "|".join((_norm(row.get("name")), _norm(row.get("role")), ",".join(skills)))
+
+
+def sync_internships(cursor, rows, aliases=None):
+  """
+  Insert/update/delete so the table matches `rows`; log every change.
+  A deleted row whose natural key is still present (or maps to one through
+  `aliases`, dropped key -> kept key from dedup) hands its applications to
+  that row instead of leaving them pointing at a missing id.
+  """
+  cursor.execute(f"SELECT id, {', '.join(FIELDS)} FROM internships ORDER BY id")
+  existing = defaultdict(list)
+  for row in cursor.fetchall():
+    existing[natural_key(dict(zip(FIELDS, row[1:])))].append((row[0], tuple(row[1:])))
+  cursor.execute("SELECT DISTINCT internship_id FROM internship_changes")
+  logged = {r[0] for r in cursor.fetchall()}
+
+  upserts, deletes = [], []
+  id_by_key = {}
+  inserted = updated = 0
+  for row in rows:
+    values = tuple(row.get(f) for f in FIELDS)
+    key = natural_key(row)
+    matches = existing.get(key)
+    if matches:
+      internship_id, old = matches.pop(0)
+      id_by_key.setdefault(key, internship_id)
+      if old != values:
+        cursor.execute(
+          f"UPDATE internships SET {', '.join(f + ' = ?' for f in FIELDS)} WHERE id = ?",
+          values + (internship_id,),
+        )
+        upserts.append(internship_id)
+        updated += 1
+      elif internship_id not in logged:
+        # rows imported before the change log existed
+        upserts.append(internship_id)
+    else:
+      cursor.execute(
+        f"INSERT INTO internships ({', '.join(FIELDS)}) VALUES ({', '.join('?' * len(FIELDS))})",
+        values,
+      )
+      upserts.append(cursor.lastrowid)
+      id_by_key.setdefault(key, cursor.lastrowid)
+      inserted += 1
+
+  aliases = aliases or {}
+  moves = []
+  for key, leftovers in existing.items():
+    target = id_by_key.get(aliases.get(key, key))
+    for internship_id, _ in leftovers:
+      cursor.execute("DELETE FROM internships WHERE id = ?", (internship_id,))
+      deletes.append(internship_id)
+      if target is not None:
+        moves.append((target, internship_id))
+  repoint_applications(cursor, moves)
+
+  cursor.executemany(
+    "INSERT INTO internship_changes (internship_id, op) VALUES (?, ?)",
+    [(i, "upsert") for i in upserts] + [(i, "delete") for i in deletes],
+  )
+  # Keep only the latest entry per internship: a delta from any version is
+  # still complete, and the log stays the size of the catalog.
+  cursor.execute("""
+    DELETE FROM internship_changes WHERE version NOT IN (
+      SELECT MAX(version) FROM internship_changes GROUP BY internship_id
+    )
+  """)
+  print(
+    f"🔁 Synced {len(rows)} internships: {inserted} new, {updated} updated, "
+    f"{len(deletes)} removed, {len(upserts) + len(deletes)} change-log entries."
+  )
+
+
+def repoint_applications(cursor, moves):
+  """Move applications (and their internship_stats count) for each (kept id, removed id)."""
+  if not moves:
+    return
+  cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+  tables = {r[0] for r in cursor.fetchall()}
+  if "applications" in tables:
+    cursor.executemany("UPDATE applications SET internship_id = ? WHERE internship_id = ?", moves)
+    print(f"🔗 Moved applications of {len(moves)} removed internships to the rows that replaced them.")
+  if "internship_stats" in tables:
+    cursor.executemany("""
+      INSERT INTO internship_stats (internship_id, applications)
+      SELECT ?, applications FROM internship_stats WHERE internship_id = ?
+      ON CONFLICT(internship_id) DO UPDATE
+      SET applications = internship_stats.applications + excluded.applications
+    """, moves)
+    cursor.executemany(
+      "DELETE FROM internship_stats WHERE internship_id = ?", [(old,) for _, old in moves]
+    )
+
+
+# ---------------------------------------------------------
+# 3) Near-duplicate detection (MinHash + LSH)
+# ---------------------------------------------------------
+# Rows are compared on an order-insensitive tag set (company, role, domains,
+# skills), so "Python, OpenCV, ROS" and "ROS, Python, OpenCV" are the same.
+# MinHash signatures are split into LSH bands; only rows sharing a band
+# bucket are compared, which keeps the stage roughly linear in row count.
+MINHASH_PERMUTATIONS = 64
+# 16 bands x 4 rows: a pair with Jaccard s shares a bucket with probability
+# 1 - (1 - s^4)^16, i.e. ~0.9998 at 0.8 and ~0.988 at 0.7.
+LSH_BANDS = 16
+_MERSENNE = (1 << 61) - 1
+_rng = random.Random(1337)
+_PERMUTATIONS = [
+  (_rng.randrange(1, _MERSENNE), _rng.randrange(_MERSENNE))
+  for _ in range(MINHASH_PERMUTATIONS)
+]
+
+
+def _norm(text):
+  return " ".join((text or "").lower().split())
+
+
+def canonical_tags(row):
+  tags = {"name:" + _norm(row.get("name")), "role:" + _norm(row.get("role"))}
+  for field in ("domains", "skills"):
+    for part in (row.get(field) or "").split(","):
+      if _norm(part):
+        tags.add(f"{field}:{_norm(part)}")
+  return frozenset(tags)
+
+
+def minhash(tags):
+  hashes = [
+    int.from_bytes(hashlib.blake2b(t.encode("utf-8"), digest_size=8).digest(), "big")
+    for t in tags
+  ] or [0]
+  return [min((a * h + b) % _MERSENNE for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def jaccard(a, b):
+  return len(a & b) / len(a | b) if a or b else 1.0
+
+
+def near_duplicate_clusters(rows, threshold=DEDUP_THRESHOLD):
+  """Lists of row indexes (first occurrence first) whose tags are >= threshold alike."""
+  tags = [canonical_tags(r) for r in rows]
+  band_width = MINHASH_PERMUTATIONS // LSH_BANDS
+  buckets = defaultdict(list)
+  for i, t in enumerate(tags):
+    sig = minhash(t)
+    for band in range(LSH_BANDS):
+      buckets[(band, tuple(sig[band * band_width:(band + 1) * band_width]))].append(i)
+
+  parent = list(range(len(rows)))
+
+  def find(i):
+    while parent[i] != i:
+      parent[i] = parent[parent[i]]
+      i = parent[i]
+    return i
+
+  # Every member is checked against each earlier member of the bucket (not
+  # just the first), so A~B and B~C cluster together even when A !~ C.
+  for members in buckets.values():
+    for n, other in enumerate(members[1:], 1):
+      for prev in members[:n]:
+        a, b = find(prev), find(other)
+        if a != b and jaccard(tags[prev], tags[other]) >= threshold:
+          parent[max(a, b)] = min(a, b)
+
+  clusters = defaultdict(list)
+  for i in range(len(rows)):
+    clusters[find(i)].append(i)
+  return [c for c in clusters.values() if len(c) > 1]
+
+
+def _distinct(values):
+  seen = []
+  for v in values:
+    v = (v or "").strip()
+    if v and v.lower() not in (s.lower() for s in seen):
+      seen.append(v)
+  return ", ".join(seen)
+
+
+def merge_rows(cluster_rows):
+  """First row wins, but keeps every location/mode offered and the best stipend."""
+  merged = dict(cluster_rows[0])
+  merged["location"] = _distinct(r.get("location") for r in cluster_rows)
+  merged["mode"] = _distinct(r.get("mode") for r in cluster_rows)
+  merged["stipend"] = max((r.get("stipend") for r in cluster_rows), key=parse_stipend)
+  if any(_norm(r.get("paid")) == "yes" for r in cluster_rows):
+    merged["paid"] = "Yes"
+  return merged
+
+
+def dedup_rows(rows, policy=None, threshold=None):
+  """
+  Apply the dedup policy to CSV rows; writes DEDUP_REPORT_PATH. Returns the
+  rows to insert and {natural key of a dropped row: natural key of its kept
+  row} for sync_internships.
+  """
+  policy = policy or DEDUP_POLICY
+  threshold = DEDUP_THRESHOLD if threshold is None else threshold
+  if policy == "off":
+    return rows, {}
+  if policy not in ("merge", "keep-first", "report"):
+    print(f"⚠ Unknown DEDUP_POLICY '{policy}', importing all rows.")
+    return rows, {}
+
+  clusters = near_duplicate_clusters(rows, threshold)
+  tags = {i: canonical_tags(rows[i]) for c in clusters for i in c}
+  replace, drop, aliases = {}, set(), {}
+  report = []
+  for cluster in clusters:
+    keep = cluster[0]
+    report.append({
+      "kept": {"csv_line": keep + 2, "name": rows[keep].get("name"), "role": rows[keep].get("role")},
+      "duplicates": [
+        {
+          "csv_line": i + 2,
+          "location": rows[i].get("location"),
+          "skills": rows[i].get("skills"),
+          "similarity": round(jaccard(tags[keep], tags[i]), 3),
+        }
+        for i in cluster[1:]
+      ],
+    })
+    if policy == "merge":
+      replace[keep] = merge_rows([rows[i] for i in cluster])
+    if policy in ("merge", "keep-first"):
+      drop.update(cluster[1:])
+      for i in cluster[1:]:
+        aliases[natural_key(rows[i])] = natural_key(rows[keep])
+
+  result = [replace.get(i, row) for i, row in enumerate(rows) if i not in drop]
+  duplicates = sum(len(c) - 1 for c in clusters)
+  with open(DEDUP_REPORT_PATH, "w", encoding="utf-8") as f:
+    json.dump({
+      "policy": policy,
+      "threshold": threshold,
+      "rows_in": len(rows),
+      "rows_out": len(result),
+      "clusters": report,
+    }, f, indent=2, ensure_ascii=False)
+  print(
+    f"🧹 Dedup ({policy}): {len(rows)} rows -> {len(result)} "
+    f"({duplicates} near-duplicates in {len(clusters)} clusters). Report: {DEDUP_REPORT_PATH}"
+  )
+  return result, aliases
 
 
 def insert_from_csv(cursor):
@@ -48,24 +340,8 @@ def insert_from_csv(cursor):
     print("⚠ CSV is empty, skipping.")
     return False
 
-  for row in rows:
-    cursor.execute("""
-      INSERT INTO internships
-      (name, domains, skills, paid, duration, role, location, mode, prerequisites, stipend, other)
-      VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-      row.get("name"),
-      row.get("domains"),
-      row.get("skills"),
-      row.get("paid"),
-      row.get("duration"),
-      row.get("role"),
-      row.get("location"),
-      row.get("mode"),
-      row.get("prerequisites"),
-      row.get("stipend"),
-      row.get("other"),
-    ))
+  rows, aliases = dedup_rows(rows)
+  sync_internships(cursor, rows, aliases)
 
   print(f"✅ Imported {len(rows)} internships from CSV.")
   return True
@@ -143,28 +419,36 @@ def insert_sample_data(cursor):
     },
   ]
 
-  for row in sample_internships:
-    cursor.execute("""
-      INSERT INTO internships
-      (name, domains, skills, paid, duration, role, location, mode, prerequisites, stipend, other)
-      VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (
-      row["name"],
-      row["domains"],
-      row["skills"],
-      row["paid"],
-      row["duration"],
-      row["role"],
-      row["location"],
-      row["mode"],
-      row["prerequisites"],
-      row["stipend"],
-      row["other"],
-    ))
+  sync_internships(cursor, sample_internships)
 
   print(f"✅ Inserted {len(sample_internships)} sample internships.")
 
 
+def write_catalog_index(cursor):
+  """Write the mmap-able catalog index served by app.py (see catalog_index.py)."""
+  # Change-log version this snapshot reflects, so /internships/changes never
+  # runs ahead of what list/detail/search serve from the index.
+  try:
+    version = cursor.execute("SELECT MAX(version) FROM internship_changes").fetchone()[0] or 0
+  except sqlite3.OperationalError:  # DB without a change log
+    version = None
+
+  cursor.execute("""
+    SELECT id, name, domains, skills, paid, duration, role, location, mode,
+           prerequisites, stipend, other
+    FROM internships ORDER BY id
+  """)
+  columns = [c[0] for c in cursor.description]
+  records = []
+  for row in cursor.fetchall():
+    rec = dict(zip(columns, row))
+    rec["name"] = rec["name"] or ""
+    records.append(rec)
+
+  count = write_index(records, INDEX_PATH, version=version)
+  print(f"🗂  Wrote catalog index for {count} internships (version {version}): {INDEX_PATH}")
+
+
 def main():
   print(f"\n📌 Using database: {DB_PATH}")
   conn = sqlite3.connect(DB_PATH)
@@ -172,9 +456,6 @@ def main():
 
   ensure_table(cursor)
 
-  # Clear existing data if you want a fresh import each time
-  cursor.execute("DELETE FROM internships")
-
   # 1) Try CSV
   used_csv = insert_from_csv(cursor)
 
@@ -183,6 +464,10 @@ def main():
     insert_sample_data(cursor)
 
   conn.commit()
+
+  # 3) Prebuild the shared catalog index from what was just committed
+  write_catalog_index(cursor)
+
   conn.close()
   print("\n🎉 Done! Internships are now in the database.\n")
 
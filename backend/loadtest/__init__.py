@@ -0,0 +1,11 @@
+"""
+Load-test harness for the backend.
+
+Run from the backend/ directory:
+
+    python -m loadtest.run --host http://127.0.0.1:5000 --users 50 --duration 60
+    python -m loadtest.run --gunicorn-workers 1,2,4 --users 100 --duration 60
+
+mail_sink.py stands in for Resend / Gmail SMTP and captures OTPs so the
+register -> verify scenario can complete without sending real email.
+"""
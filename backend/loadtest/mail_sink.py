@@ -0,0 +1,181 @@
+# backend/loadtest/mail_sink.py
+"""
+Local stand-in for the mail providers used by send_email_otp.
+
+It accepts mail over both transports the backend supports and remembers the
+last OTP sent to each address:
+
+  - HTTP, Resend-compatible:  POST /emails   {"to": [...], "text": "..."}
+  - SMTP, plain (no TLS):     any AUTH accepted, message body parsed
+
+Load scenarios read OTPs back with  GET /otp?email=<address>  (404 until one
+arrives). Point the backend at it with
+
+    RESEND_API_KEY=loadtest RESEND_API_URL=http://127.0.0.1:8025/emails
+or
+    EMAIL_USER=x EMAIL_PASS=x SMTP_HOST=127.0.0.1 SMTP_PORT=8026 SMTP_USE_SSL=0
+
+Run standalone:  python -m loadtest.mail_sink --http-port 8025 --smtp-port 8026
+"""
+import re
+import json
+import argparse
+import threading
+import socketserver
+from email import message_from_bytes
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+OTP_RE = re.compile(r"\b(\d{6})\b")
+
+
+class OtpStore:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._otps = {}
+        self._arrived = threading.Condition(self._lock)
+        self.received = 0
+
+    def record(self, recipients, text):
+        m = OTP_RE.search(text or "")
+        with self._arrived:
+            self.received += 1
+            if m:
+                for rcpt in recipients:
+                    self._otps[rcpt.strip().lower()] = m.group(1)
+            self._arrived.notify_all()
+
+    def get(self, email, timeout=0.0):
+        """Latest OTP for `email`, waiting up to `timeout` seconds for one."""
+        email = email.strip().lower()
+        with self._arrived:
+            self._arrived.wait_for(lambda: email in self._otps, timeout=timeout)
+            return self._otps.get(email)
+
+
+store = OtpStore()
+
+
+# ---------------------------
+# HTTP (Resend-compatible)
+# ---------------------------
+class _HttpHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self, status, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            return self._reply(400, {"message": "invalid JSON"})
+        to = payload.get("to") or []
+        store.record([to] if isinstance(to, str) else to, payload.get("text") or payload.get("html"))
+        self._reply(200, {"id": f"sink-{store.received}"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/otp":
+            return self._reply(404, {"message": "not found"})
+        query = parse_qs(url.query)
+        email = (query.get("email") or [""])[0]
+        wait = float((query.get("wait") or ["0"])[0])
+        otp = store.get(email, timeout=min(wait, 10.0))
+        if otp is None:
+            return self._reply(404, {"message": "no OTP for this address"})
+        self._reply(200, {"email": email, "otp": otp})
+
+    def log_message(self, *args):
+        pass
+
+
+# ---------------------------
+# SMTP (just enough of RFC 5321 for smtplib)
+# ---------------------------
+class _SmtpHandler(socketserver.StreamRequestHandler):
+    def _send(self, line):
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self):
+        self._send("220 mail-sink ESMTP")
+        recipients = []
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            line = raw.decode("utf-8", "replace").rstrip("\r\n")
+            verb = line.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self._send("250-mail-sink")
+                self._send("250 AUTH PLAIN LOGIN")
+            elif verb == "HELO":
+                self._send("250 mail-sink")
+            elif verb == "AUTH":
+                self._send("235 2.7.0 Authentication successful")
+            elif verb == "MAIL":
+                recipients = []
+                self._send("250 OK")
+            elif verb == "RCPT":
+                m = re.search(r"<([^>]*)>", line)
+                if m:
+                    recipients.append(m.group(1))
+                self._send("250 OK")
+            elif verb == "DATA":
+                self._send("354 End data with <CR><LF>.<CR><LF>")
+                data = bytearray()
+                while True:
+                    chunk = self.rfile.readline()
+                    if not chunk or chunk in (b".\r\n", b".\n"):
+                        break
+                    data += chunk[1:] if chunk.startswith(b"..") else chunk
+                msg = message_from_bytes(bytes(data))
+                body = msg.get_payload(decode=True) if not msg.is_multipart() else None
+                text = body.decode("utf-8", "replace") if body else str(msg)
+                store.record(recipients, text)
+                self._send("250 OK")
+            elif verb == "QUIT":
+                self._send("221 Bye")
+                return
+            else:
+                self._send("250 OK")
+
+
+class _ThreadingSmtpServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def start(http_port=8025, smtp_port=8026, host="127.0.0.1"):
+    """Start both sinks on daemon threads; returns the servers."""
+    servers = []
+    http_server = ThreadingHTTPServer((host, http_port), _HttpHandler)
+    http_server.daemon_threads = True
+    servers.append(http_server)
+    if smtp_port:
+        servers.append(_ThreadingSmtpServer((host, smtp_port), _SmtpHandler))
+    for server in servers:
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+    return servers
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local OTP mail sink.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--http-port", type=int, default=8025)
+    parser.add_argument("--smtp-port", type=int, default=8026)
+    args = parser.parse_args()
+
+    start(args.http_port, args.smtp_port, args.host)
+    print(f"📬 mail sink: http://{args.host}:{args.http_port}/emails, smtp {args.host}:{args.smtp_port}")
+    threading.Event().wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,337 @@
+# backend/loadtest/run.py
+"""
+Closed-loop load generator with Locust-style weighted scenarios.
+
+Each virtual user runs on its own thread with its own HTTP session and keeps
+picking a scenario by weight until the run ends:
+
+  browse  GET /internships -> POST /internships/search -> GET /internships/<id> -> POST /apply
+  auth    POST /otp/register/request -> (OTP read from the mail sink)
+          -> POST /otp/register/verify -> GET /api/me
+
+Per endpoint it reports requests, errors, throughput and latency percentiles.
+
+Against a running server (its email settings must point at the sink, see
+mail_sink.py, and it needs RATELIMIT_ENABLED=0 since every virtual user
+shares one IP):
+
+    python -m loadtest.run --host http://127.0.0.1:5000 --users 50 --duration 60
+
+Capacity sweep: start gunicorn for each worker count (wired to an in-process
+sink), load it, stop it:
+
+    python -m loadtest.run --gunicorn-workers 1,2,4,8 --users 100 --duration 60
+
+Every sweep run serves a fresh copy of --database (default: database.db, only
+read) in a temp directory, with its own catalog index, so runs start from the
+same data and the load's users and applications never reach the real DB.
+Against --host the server's own database is used; point it at a scratch one.
+
+Note: pending OTPs live in each worker's memory, so with several workers a
+verify can land on a worker that never saw the request. The sweep therefore
+runs the auth scenario only with a single worker and says so in the report;
+against --host, run it on one worker too.
+"""
+import io
+import os
+import sys
+import json
+import time
+import uuid
+import random
+import sqlite3
+import argparse
+import tempfile
+import threading
+import subprocess
+from collections import defaultdict
+from contextlib import redirect_stdout
+
+import requests
+
+import import_internships
+from loadtest import mail_sink
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SEARCH_FILTERS = [
+    {},
+    {"domain": "Data Science"},
+    {"domain": ["Web Development", "App Development"]},
+    {"skill": "python"},
+    {"skill": ["sql", "react"], "mode": "remote"},
+    {"location": "bengaluru", "paid": "yes"},
+]
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, int(round(pct / 100 * len(sorted_values))) - 1))
+    return sorted_values[k]
+
+
+class Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def record(self, name, seconds, ok):
+        with self._lock:
+            self.latencies[name].append(seconds)
+            if not ok:
+                self.errors[name] += 1
+
+    def report(self, elapsed):
+        rows = []
+        for name in sorted(self.latencies):
+            values = sorted(self.latencies[name])
+            rows.append({
+                "endpoint": name,
+                "requests": len(values),
+                "errors": self.errors[name],
+                "rps": round(len(values) / elapsed, 2),
+                "p50_ms": round(percentile(values, 50) * 1000, 2),
+                "p90_ms": round(percentile(values, 90) * 1000, 2),
+                "p99_ms": round(percentile(values, 99) * 1000, 2),
+                "max_ms": round(values[-1] * 1000, 2),
+            })
+        return rows
+
+
+class VirtualUser:
+    def __init__(self, host, sink_url, stats, seed):
+        self.host = host.rstrip("/")
+        self.sink_url = sink_url.rstrip("/")
+        self.stats = stats
+        self.rng = random.Random(seed)
+        self.session = requests.Session()
+
+    def request(self, name, method, path, expect=(200,), **kwargs):
+        start = time.perf_counter()
+        try:
+            resp = self.session.request(method, self.host + path, timeout=30, **kwargs)
+            ok = resp.status_code in expect
+        except requests.RequestException:
+            resp, ok = None, False
+        self.stats.record(name, time.perf_counter() - start, ok)
+        return resp if ok else None
+
+    # ----- scenarios -----
+    def browse(self):
+        self.request("GET /internships", "GET", "/internships")
+        resp = self.request(
+            "POST /internships/search", "POST", "/internships/search",
+            json=dict(self.rng.choice(SEARCH_FILTERS)),
+        )
+        results = (resp.json().get("results") or []) if resp is not None else []
+        if not results:
+            return
+        internship_id = self.rng.choice(results)["id"]
+        self.request("GET /internships/<id>", "GET", f"/internships/{internship_id}")
+        self.request(
+            "POST /apply", "POST", "/apply",
+            json={
+                "internship_id": internship_id,
+                "name": "Load Test",
+                "email": f"load-{self.rng.randrange(10**6)}@example.com",
+                "country": "India",
+                "age": 21,
+                "college_name": "Anna University",
+            },
+        )
+
+    def auth(self):
+        email = f"load-{uuid.uuid4().hex[:12]}@example.com"
+        if self.request(
+            "POST /otp/register/request", "POST", "/otp/register/request", json={"email": email}
+        ) is None:
+            return
+        try:
+            sink = requests.get(
+                f"{self.sink_url}/otp", params={"email": email, "wait": 5}, timeout=10
+            )
+            otp = sink.json().get("otp") if sink.ok else None
+        except requests.RequestException:
+            otp = None
+        if not otp:
+            self.stats.record("mail sink: OTP delivered", 0.0, False)
+            return
+        resp = self.request(
+            "POST /otp/register/verify", "POST", "/otp/register/verify",
+            json={
+                "email": email, "otp": otp, "username": "Load Test",
+                "phone": "9000000000", "password": "load-test-password",
+            },
+        )
+        token = resp.json().get("token") if resp is not None else None
+        if token:
+            self.request(
+                "GET /api/me", "GET", "/api/me", headers={"Authorization": f"Bearer {token}"}
+            )
+
+
+def run_load(host, sink_url, users, duration, spawn_rate, weights, seed=0):
+    stats = Stats()
+    stop = threading.Event()
+    scenarios = list(weights)
+
+    def loop(n):
+        user = VirtualUser(host, sink_url, stats, seed + n)
+        scenario_weights = [weights[s] for s in scenarios]
+        while not stop.is_set():
+            getattr(user, user.rng.choices(scenarios, scenario_weights)[0])()
+
+    threads = []
+    start = time.perf_counter()
+    for n in range(users):
+        t = threading.Thread(target=loop, args=(n,), daemon=True)
+        t.start()
+        threads.append(t)
+        if spawn_rate:
+            time.sleep(1 / spawn_rate)
+    remaining = duration - (time.perf_counter() - start)
+    if remaining > 0:
+        time.sleep(remaining)
+    stop.set()
+    for t in threads:
+        t.join(timeout=35)
+    return stats.report(time.perf_counter() - start)
+
+
+def print_report(title, rows, note=None):
+    print(f"\n== {title} ==")
+    if note:
+        print(f"({note})")
+    print(f"{'endpoint':<32}{'reqs':>8}{'errs':>7}{'rps':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}")
+    for r in rows:
+        print(
+            f"{r['endpoint']:<32}{r['requests']:>8}{r['errors']:>7}{r['rps']:>9}"
+            f"{r['p50_ms']:>9}{r['p90_ms']:>9}{r['p99_ms']:>9}{r['max_ms']:>9}"
+        )
+
+
+def _wait_until_up(url, timeout=30):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if requests.get(url, timeout=1).ok:
+                return True
+        except requests.RequestException:
+            time.sleep(0.2)
+    return False
+
+
+def prepare_database(template, workdir):
+    """Copy `template` into `workdir`, index the copy; env vars pointing at both."""
+    db_path = os.path.join(workdir, "loadtest.db")
+    src, dst = sqlite3.connect(template), sqlite3.connect(db_path)
+    src.backup(dst)
+    src.close()
+    import_internships.INDEX_PATH = f"{db_path}.idx"
+    with redirect_stdout(io.StringIO()):
+        import_internships.write_catalog_index(dst.cursor())
+    dst.close()
+    return {"DATABASE_PATH": db_path, "CATALOG_INDEX_PATH": import_internships.INDEX_PATH}
+
+
+def start_gunicorn(workers, port, sink_http_port, worker_class, threads, db_env):
+    # Settings go through gunicorn.conf.py's environment knobs so the run uses
+    # the production config (preload, hooks, gevent patching) unchanged.
+    env = dict(
+        os.environ,
+        RESEND_API_KEY="loadtest",
+        RESEND_API_URL=f"http://127.0.0.1:{sink_http_port}/emails",
+        GUNICORN_BIND=f"127.0.0.1:{port}",
+        WEB_CONCURRENCY=str(workers),
+        GUNICORN_WORKER_CLASS=worker_class,
+        GUNICORN_THREADS=str(threads),
+        GUNICORN_LOGLEVEL="warning",
+        # every virtual user comes from 127.0.0.1
+        RATELIMIT_ENABLED="0",
+        **db_env,
+    )
+    cmd = [sys.executable, "-m", "gunicorn", "--config", "gunicorn.conf.py"]
+    proc = subprocess.Popen(cmd, cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL)
+    if not _wait_until_up(f"http://127.0.0.1:{port}/"):
+        proc.terminate()
+        raise RuntimeError(f"gunicorn with {workers} workers did not come up")
+    return proc
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the backend.")
+    parser.add_argument("--host", default="http://127.0.0.1:5000")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--spawn-rate", type=float, default=10.0, help="users started per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds per run")
+    parser.add_argument("--browse-weight", type=int, default=4)
+    parser.add_argument("--auth-weight", type=int, default=1)
+    parser.add_argument("--sink-url", help="external mail sink (default: start one in-process)")
+    parser.add_argument("--sink-http-port", type=int, default=8025)
+    parser.add_argument("--sink-smtp-port", type=int, default=8026)
+    parser.add_argument("--gunicorn-workers", help="comma list of worker counts to sweep")
+    parser.add_argument("--worker-class", default="sync")
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--port", type=int, default=5055, help="port for spawned gunicorn")
+    parser.add_argument(
+        "--database",
+        default=os.path.join(BACKEND_DIR, "database.db"),
+        help="database copied for each spawned gunicorn (never written)",
+    )
+    parser.add_argument("--out", help="write the report as JSON")
+    args = parser.parse_args()
+
+    weights = {"browse": args.browse_weight, "auth": args.auth_weight}
+    weights = {k: v for k, v in weights.items() if v > 0}
+    if args.gunicorn_workers and not os.path.exists(args.database):
+        parser.error(f"{args.database} not found; run import_internships.py or pass --database")
+
+    sink_url = args.sink_url
+    if not sink_url:
+        mail_sink.start(args.sink_http_port, args.sink_smtp_port)
+        sink_url = f"http://127.0.0.1:{args.sink_http_port}"
+
+    runs = []
+    if args.gunicorn_workers:
+        for workers in (int(w) for w in args.gunicorn_workers.split(",")):
+            run_weights, note = weights, None
+            if workers > 1 and "auth" in weights:
+                run_weights = {k: v for k, v in weights.items() if k != "auth"}
+                note = "auth scenario skipped: pending OTPs are per worker"
+            if not run_weights:
+                print_report(f"{workers} x {args.worker_class} worker(s)", [], note)
+                continue
+            with tempfile.TemporaryDirectory() as tmp:
+                proc = start_gunicorn(
+                    workers, args.port, args.sink_http_port, args.worker_class, args.threads,
+                    prepare_database(args.database, tmp),
+                )
+                try:
+                    rows = run_load(
+                        f"http://127.0.0.1:{args.port}", sink_url,
+                        args.users, args.duration, args.spawn_rate, run_weights,
+                    )
+                finally:
+                    proc.terminate()
+                    proc.wait(timeout=30)
+            title = f"{workers} x {args.worker_class} worker(s), {args.threads} thread(s)"
+            print_report(title, rows, note)
+            runs.append({"workers": workers, "worker_class": args.worker_class,
+                         "threads": args.threads, "weights": run_weights,
+                         "note": note, "endpoints": rows})
+    else:
+        rows = run_load(args.host, sink_url, args.users, args.duration, args.spawn_rate, weights)
+        print_report(args.host, rows)
+        runs.append({"host": args.host, "endpoints": rows})
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump({"users": args.users, "duration": args.duration,
+                       "weights": weights, "runs": runs}, f, indent=2)
+        print(f"\n✅ wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,272 @@
+# backend/metrics.py
+"""
+In-process request metrics exposed in Prometheus text format at /metrics.
+
+Recorded per worker process:
+  - http_request_duration_seconds{method,route,status}   histogram
+  - http_request_sql_queries{route}                       histogram (queries per request)
+  - http_request_sql_seconds{route}                       histogram (SQL time per request)
+  - sql_query_duration_seconds                            histogram (every statement)
+  - function_duration_seconds{function}                   histogram (functions wrapped with @timed)
+  - email_send_duration_seconds{outcome}                  histogram
+  - cache_requests_total{cache,result}                    counter (hit/miss, read at scrape time)
+  - rate_limited_requests_total{scope,key}                counter (429s from ratelimit.py)
+
+Each gunicorn worker keeps its own registry, so scrape workers individually
+(or sum across scrapes); no shared state is needed on the hot path.
+"""
+import os
+import time
+from bisect import bisect_left
+from functools import wraps
+from threading import Lock
+
+from flask import Response, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+
+def _label_str(names, values, extra=None):
+    pairs = list(zip(names, values))
+    if extra:
+        pairs.append(extra)
+    if not pairs:
+        return ""
+    body = ",".join(
+        '%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in pairs
+    )
+    return "{" + body + "}"
+
+
+def _fmt(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Histogram:
+    def __init__(self, name, help_text, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = Lock()
+
+    def observe(self, value, *label_values):
+        idx = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            if idx < len(self.buckets):
+                series[idx] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = [(k, list(v)) for k, v in self._series.items()]
+        for label_values, series in sorted(items):
+            cumulative = 0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                labels = _label_str(self.labels, label_values, ("le", _fmt(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _label_str(self.labels, label_values, ("le", "+Inf"))
+            lines.append(f"{self.name}_bucket{labels} {series[-1]}")
+            labels = _label_str(self.labels, label_values)
+            lines.append(f"{self.name}_sum{labels} {_fmt(float(series[-2]))}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class CallbackCounter:
+    """Counter whose samples are read from existing objects at scrape time."""
+
+    def __init__(self, name, help_text, labels, read):
+        self.name = name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._read = read  # -> iterable of (label values, value)
+
+    def collect(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for label_values, value in self._read():
+            lines.append(f"{self.name}{_label_str(self.labels, label_values)} {value}")
+        return lines
+
+
+# ---------------------------
+# Registry
+# ---------------------------
+request_duration = Histogram(
+    "http_request_duration_seconds", "Request latency by route.", ("method", "route", "status")
+)
+request_sql_queries = Histogram(
+    "http_request_sql_queries", "SQL statements executed per request.", ("route",), COUNT_BUCKETS
+)
+request_sql_seconds = Histogram(
+    "http_request_sql_seconds", "Time spent in SQL per request.", ("route",)
+)
+sql_query_duration = Histogram(
+    "sql_query_duration_seconds", "Duration of individual SQL statements."
+)
+function_duration = Histogram(
+    "function_duration_seconds", "Duration of instrumented hot-path functions.", ("function",)
+)
+email_send_duration = Histogram(
+    "email_send_duration_seconds", "OTP email delivery latency.", ("outcome",)
+)
+
+_caches = {}  # name -> object with .hits / .misses
+
+
+def _read_caches():
+    for name, cache in sorted(_caches.items()):
+        yield (name, "hit"), cache.hits
+        yield (name, "miss"), cache.misses
+
+
+cache_requests = CallbackCounter(
+    "cache_requests_total", "Cache lookups by result.", ("cache", "result"), _read_caches
+)
+
+_rate_limiters = []  # objects with .rejected = {(scope, key): count}
+
+
+def _read_rate_limits():
+    for rate_limiter in _rate_limiters:
+        yield from sorted(rate_limiter.rejected.items())
+
+
+rate_limited = CallbackCounter(
+    "rate_limited_requests_total", "Requests rejected by the rate limiter.", ("scope", "key"),
+    _read_rate_limits,
+)
+
+REGISTRY = [
+    request_duration,
+    request_sql_queries,
+    request_sql_seconds,
+    sql_query_duration,
+    function_duration,
+    email_send_duration,
+    cache_requests,
+    rate_limited,
+]
+
+
+def register_cache(name, cache):
+    """Report `cache.hits` / `cache.misses` as cache_requests_total{cache=name}."""
+    _caches[name] = cache
+
+
+def register_rate_limiter(rate_limiter):
+    """Report `rate_limiter.rejected` as rate_limited_requests_total."""
+    if rate_limiter not in _rate_limiters:
+        _rate_limiters.append(rate_limiter)
+
+
+def render():
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.collect())
+    return "\n".join(lines) + "\n"
+
+
+# ---------------------------
+# Instrumentation helpers
+# ---------------------------
+def timed(fn):
+    """Record every call of `fn` in function_duration_seconds{function=fn.__name__}."""
+    name = fn.__name__
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            function_duration.observe(time.perf_counter() - start, name)
+
+    return wrapper
+
+
+def timed_email(fn):
+    """Like `timed`, plus email_send_duration_seconds labelled by the bool result."""
+    fn = timed(fn)
+
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        outcome = "error"
+        try:
+            ok = fn(*args, **kwargs)
+            outcome = "sent" if ok else "failed"
+            return ok
+        finally:
+            email_send_duration.observe(time.perf_counter() - start, outcome)
+
+    return wrapper
+
+
+def _route_label():
+    rule = request.url_rule
+    return rule.rule if rule is not None else "<unmatched>"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    sql_query_duration.observe(elapsed)
+    if has_request_context() and "metrics_start" in g:
+        g.metrics_sql_count += 1
+        g.metrics_sql_time += elapsed
+
+
+def _start_timer():
+    g.metrics_start = time.perf_counter()
+    g.metrics_sql_count = 0
+    g.metrics_sql_time = 0.0
+
+
+def _record_request(response):
+    start = g.pop("metrics_start", None)
+    if start is None:
+        return response
+    route = _route_label()
+    request_duration.observe(
+        time.perf_counter() - start, request.method, route, str(response.status_code)
+    )
+    request_sql_queries.observe(g.metrics_sql_count, route)
+    request_sql_seconds.observe(g.metrics_sql_time, route)
+    return response
+
+
+def metrics_endpoint():
+    if METRICS_TOKEN:
+        if request.headers.get("Authorization", "") != f"Bearer {METRICS_TOKEN}":
+            return Response("Unauthorized\n", status=401, mimetype="text/plain")
+    return Response(render(), mimetype="text/plain; version=0.0.4")
+
+
+def init_metrics(app):
+    """Hook request timing, SQL counting and the /metrics endpoint into `app`."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    app.before_request(_start_timer)
+    app.after_request(_record_request)
+    app.add_url_rule("/metrics", "metrics", metrics_endpoint, methods=["GET"])
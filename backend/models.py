@@ -41,7 +41,7 @@ class Internships(db.Model):
 class Applications(db.Model):
     __tablename__ = "applications"
     id = db.Column(db.Integer, primary_key=True)
-    internship_id = db.Column(db.Integer, nullable=False)
+    internship_id = db.Column(db.Integer, nullable=False, index=True)
     name = db.Column(db.String(200), nullable=False)
     email = db.Column(db.String(200), nullable=False)
     country = db.Column(db.String(200), nullable=True)
@@ -50,3 +50,55 @@ class Applications(db.Model):
 
     def __repr__(self):
         return f"<Application {self.id} internship:{self.internship_id}>"
+
+class InternshipChanges(db.Model):
+    """Change log written by import_internships.py; latest entry per internship only."""
+    __tablename__ = "internship_changes"
+    __table_args__ = {"sqlite_autoincrement": True}  # versions never go backwards
+    version = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    internship_id = db.Column(db.Integer, nullable=False, index=True)
+    op = db.Column(db.String(10), nullable=False)  # "upsert" | "delete"
+
+    def __repr__(self):
+        return f"<InternshipChange v{self.version} {self.op} {self.internship_id}>"
+
+
+# ---------------------------
+# Application summaries (maintained by stats.py)
+# ---------------------------
+class InternshipStats(db.Model):
+    __tablename__ = "internship_stats"
+    internship_id = db.Column(db.Integer, primary_key=True)
+    applications = db.Column(db.Integer, nullable=False, default=0, index=True)
+
+    def __repr__(self):
+        return f"<InternshipStats {self.internship_id}: {self.applications}>"
+
+class DomainStats(db.Model):
+    __tablename__ = "domain_stats"
+    domain = db.Column(db.String(200), primary_key=True)
+    applications = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DomainStats {self.domain}: {self.applications}>"
+
+class CollegeStats(db.Model):
+    __tablename__ = "college_stats"
+    college = db.Column(db.String(300), primary_key=True)
+    applications = db.Column(db.Integer, nullable=False, default=0, index=True)
+
+    def __repr__(self):
+        return f"<CollegeStats {self.college}: {self.applications}>"
+
+class DailyStats(db.Model):
+    __tablename__ = "daily_stats"
+    day = db.Column(db.String(10), primary_key=True)  # YYYY-MM-DD (UTC)
+    applications = db.Column(db.Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DailyStats {self.day}: {self.applications}>"
+
+class StatsState(db.Model):
+    __tablename__ = "stats_state"
+    name = db.Column(db.String(100), primary_key=True)   # e.g. "applications_last_id"
+    value = db.Column(db.Integer, nullable=False, default=0)
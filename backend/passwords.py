@@ -0,0 +1,149 @@
+# backend/passwords.py
+"""
+Password hashing with scrypt, run on a dedicated pool.
+
+Stored format:  scrypt$<n>$<r>$<p>$<salt b64>$<hash b64>
+
+Cost parameters come from PASSWORD_SCRYPT_N / _R / _P. A successful login
+whose stored hash used other parameters, or which still holds a plaintext
+password from before hashing existed, is rehashed with the current ones
+(`check_password` sets user.password; the caller's commit saves it), so
+rows migrate lazily as people log in.
+
+hashlib.scrypt releases the GIL, so hashing runs in a bounded pool of
+PASSWORD_HASH_WORKERS threads (default: CPU count). That caps how many
+cores login can take, and the thread that handles the request only waits.
+PASSWORD_HASH_POOL=process uses processes instead. Under gevent workers
+gevent's native-thread executor is used so other greenlets keep running,
+and asgi.py awaits the pool through the *_async helpers.
+"""
+import os
+import hmac
+import base64
+import hashlib
+
+SCRYPT_N = int(os.getenv("PASSWORD_SCRYPT_N", str(2 ** 14)))
+SCRYPT_R = int(os.getenv("PASSWORD_SCRYPT_R", "8"))
+SCRYPT_P = int(os.getenv("PASSWORD_SCRYPT_P", "1"))
+SALT_BYTES = 16
+KEY_BYTES = 32
+
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+PASSWORD_HASH_POOL = os.getenv("PASSWORD_HASH_POOL", "thread")
+
+PREFIX = "scrypt$"
+
+_pool = None
+
+
+def _b64(data):
+    return base64.b64encode(data).decode("ascii")
+
+
+def _scrypt(password, salt, n, r, p):
+    return hashlib.scrypt(
+        password.encode("utf-8"), salt=salt, n=n, r=r, p=p,
+        maxmem=128 * r * (n + p + 2), dklen=KEY_BYTES,
+    )
+
+
+def _hash(password, n, r, p):
+    salt = os.urandom(SALT_BYTES)
+    return f"{PREFIX}{n}${r}${p}${_b64(salt)}${_b64(_scrypt(password, salt, n, r, p))}"
+
+
+def _verify(stored, password, n, r, p):
+    """(matches, needs_rehash) for a stored value against the current params."""
+    if not stored or not stored.startswith(PREFIX):
+        # plaintext row from before hashing
+        ok = hmac.compare_digest((stored or "").encode("utf-8"), password.encode("utf-8"))
+        return ok, True
+    try:
+        _, sn, sr, sp, salt, expected = stored.split("$")
+        sn, sr, sp = int(sn), int(sr), int(sp)
+        digest = _scrypt(password, base64.b64decode(salt), sn, sr, sp)
+    except (ValueError, TypeError):
+        return False, False
+    ok = hmac.compare_digest(digest, base64.b64decode(expected))
+    return ok, (sn, sr, sp) != (n, r, p)
+
+
+def _get_pool():
+    global _pool
+    if _pool is None:
+        try:
+            from gevent import monkey
+
+            patched = monkey.is_module_patched("threading")
+        except ImportError:
+            patched = False
+        if patched:
+            # native threads even though `threading` is patched; result()
+            # yields to the hub instead of blocking the worker
+            from gevent.threadpool import ThreadPoolExecutor as GeventExecutor
+
+            _pool = GeventExecutor(max_workers=PASSWORD_HASH_WORKERS)
+        elif PASSWORD_HASH_POOL == "process":
+            from concurrent.futures import ProcessPoolExecutor
+
+            _pool = ProcessPoolExecutor(max_workers=PASSWORD_HASH_WORKERS)
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            _pool = ThreadPoolExecutor(
+                max_workers=PASSWORD_HASH_WORKERS, thread_name_prefix="password-hash"
+            )
+    return _pool
+
+
+def _run(fn, *args):
+    return _get_pool().submit(fn, *args).result()
+
+
+async def _run_async(fn, *args):
+    import asyncio  # only the ASGI app gets here; keep it off the Flask import path
+
+    return await asyncio.wrap_future(_get_pool().submit(fn, *args))
+
+
+def _dummy_hash():
+    """
+    Checked when the account doesn't exist, so a miss costs the same scrypt
+    as a wrong password and response times don't reveal which emails exist.
+    """
+    return f"{PREFIX}{SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${_b64(bytes(SALT_BYTES))}${_b64(bytes(KEY_BYTES))}"
+
+
+# ---------------------------
+# Public API
+# ---------------------------
+def hash_password(password):
+    return _run(_hash, password, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+
+def check_password(user, password):
+    """
+    True if `password` is right for `user` (None -> always False, same cost).
+    Upgrades user.password to a current hash when needed; caller commits.
+    """
+    stored = user.password if user is not None else _dummy_hash()
+    ok, needs_rehash = _run(_verify, stored, password, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    if user is None or not ok:
+        return False
+    if needs_rehash:
+        user.password = hash_password(password)
+    return True
+
+
+async def hash_password_async(password):
+    return await _run_async(_hash, password, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+
+
+async def check_password_async(user, password):
+    stored = user.password if user is not None else _dummy_hash()
+    ok, needs_rehash = await _run_async(_verify, stored, password, SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    if user is None or not ok:
+        return False
+    if needs_rehash:
+        user.password = await hash_password_async(password)
+    return True
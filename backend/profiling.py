@@ -0,0 +1,273 @@
+# backend/profiling.py
+"""
+Opt-in, per-request profiling for live workers.
+
+A request is profiled when either
+  - it carries `X-Profile: <PROFILE_ADMIN_TOKEN>`, or
+  - it is picked by random sampling at PROFILE_SAMPLE_RATE (0.0 - 1.0).
+
+PROFILE_MODE selects how:
+  - "sample"   (default) a background thread samples the request thread's
+               stack every PROFILE_INTERVAL seconds -> collapsed stacks
+  - "cprofile" deterministic cProfile -> aggregated pstats
+
+Under gevent (threading monkey-patched) request "threads" are greenlets that
+never show up in sys._current_frames(), so "sample" falls back to cprofile.
+All greenlets share one OS thread and one profiler hook there, so only one
+request is profiled at a time; overlapping ones are skipped.
+
+Results are aggregated per profile key: method, route rule and, for the
+routes listed in PROFILE_BODY_FIELDS, which of their known body fields are
+non-empty, e.g. "POST /internships/search [domain,mode]", so slow filter
+combinations show up as their own entries. Other body keys are ignored (the
+client picks them), and past PROFILE_MAX_KEYS distinct keys new ones are
+folded into OTHER_KEY, so profiling memory stays bounded.
+
+Admin endpoints (Bearer PROFILE_ADMIN_TOKEN; disabled when unset):
+  GET    /admin/profiles             summary per key
+  GET    /admin/profiles/collapsed   flamegraph.pl / speedscope input (?key=)
+  GET    /admin/profiles/pstats      top functions by cumulative time (?key=&limit=)
+  DELETE /admin/profiles             reset
+"""
+import io
+import os
+import sys
+import time
+import random
+import pstats
+import cProfile
+import threading
+from collections import Counter
+
+from flask import Response, g, jsonify, request
+
+PROFILE_ADMIN_TOKEN = os.getenv("PROFILE_ADMIN_TOKEN")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_MODE = os.getenv("PROFILE_MODE", "sample")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", "0.005"))
+PROFILE_MAX_KEYS = int(os.getenv("PROFILE_MAX_KEYS", "200"))
+MAX_STACK_DEPTH = 64
+
+# route rule -> body fields that may appear in its profile key
+PROFILE_BODY_FIELDS = {
+    "/internships/search": ("domain", "skill", "location", "mode", "paid"),
+}
+OTHER_KEY = "<other>"
+
+_lock = threading.Lock()
+_collapsed = {}   # key -> Counter("frame;frame;frame" -> samples)
+_pstats = {}      # key -> pstats.Stats
+_requests = Counter()
+_seconds = Counter()
+_greenlet_profile = threading.Lock()  # held by the one profiled request under gevent
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class StackSampler(threading.Thread):
+    """Samples one thread's Python stack until stopped."""
+
+    def __init__(self, target_thread_id, interval=PROFILE_INTERVAL):
+        super().__init__(daemon=True)
+        self.target_thread_id = target_thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.target_thread_id)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < MAX_STACK_DEPTH:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+        return self.stacks
+
+
+def profile_key():
+    rule = request.url_rule.rule if request.url_rule is not None else "<unmatched>"
+    key = f"{request.method} {rule}"
+    fields = PROFILE_BODY_FIELDS.get(rule)
+    if fields and request.is_json:
+        body = request.get_json(silent=True)
+        if isinstance(body, dict):
+            present = [f for f in fields if body.get(f) not in (None, "", [], {})]
+            key += f" [{','.join(present)}]"
+    return key
+
+
+def _threads_patched():
+    # Checked per request: gunicorn patches in the worker, after a preloaded import.
+    monkey = sys.modules.get("gevent.monkey")
+    return monkey is not None and monkey.is_module_patched("threading")
+
+
+def profile_mode():
+    """PROFILE_MODE, or "cprofile" where the stack sampler can't see requests."""
+    if PROFILE_MODE != "cprofile" and _threads_patched():
+        return "cprofile"
+    return PROFILE_MODE
+
+
+def _should_profile():
+    if PROFILE_ADMIN_TOKEN and request.headers.get("X-Profile") == PROFILE_ADMIN_TOKEN:
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def _start_profile():
+    if request.path.startswith("/admin/profiles") or not _should_profile():
+        return
+    mode = profile_mode()
+    if mode == "cprofile" and _threads_patched():
+        if not _greenlet_profile.acquire(blocking=False):
+            return
+        g.profile_lock = _greenlet_profile
+    g.profile_started = time.perf_counter()
+    if mode == "cprofile":
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+    else:
+        g.profiler = StackSampler(threading.get_ident())
+        g.profiler.start()
+
+
+def _stop_profile(response):
+    profiler = g.pop("profiler", None)
+    if profiler is None:
+        return response
+    elapsed = time.perf_counter() - g.pop("profile_started")
+    key = profile_key()
+    with _lock:
+        if key not in _requests and len(_requests) >= PROFILE_MAX_KEYS:
+            key = OTHER_KEY
+
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+        _release_profile_lock()
+        with _lock:
+            if key in _pstats:
+                _pstats[key].add(profiler)
+            else:
+                _pstats[key] = pstats.Stats(profiler)
+    else:
+        stacks = profiler.stop()
+        with _lock:
+            _collapsed.setdefault(key, Counter()).update(stacks)
+
+    with _lock:
+        _requests[key] += 1
+        _seconds[key] += elapsed
+    response.headers["X-Profiled-As"] = key
+    return response
+
+
+def _abandon_profile(exc):
+    """teardown: never leave a sampler thread running if after_request was skipped."""
+    profiler = g.pop("profiler", None)
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+    elif profiler is not None:
+        profiler.stop()
+    _release_profile_lock()
+
+
+def _release_profile_lock():
+    lock = g.pop("profile_lock", None)
+    if lock is not None:
+        lock.release()
+
+
+# ---------------------------
+# Admin endpoints
+# ---------------------------
+def _authorized():
+    return bool(PROFILE_ADMIN_TOKEN) and (
+        request.headers.get("Authorization", "") == f"Bearer {PROFILE_ADMIN_TOKEN}"
+    )
+
+
+def _unauthorized():
+    return jsonify({"success": False, "message": "Unauthorized"}), 401
+
+
+def profiles_summary():
+    if not _authorized():
+        return _unauthorized()
+    with _lock:
+        data = {
+            key: {
+                "requests": _requests[key],
+                "total_seconds": round(_seconds[key], 6),
+                "avg_seconds": round(_seconds[key] / _requests[key], 6),
+                "samples": sum(_collapsed[key].values()) if key in _collapsed else 0,
+                "has_pstats": key in _pstats,
+            }
+            for key in _requests
+        }
+    return jsonify({"success": True, "mode": profile_mode(), "profiles": data}), 200
+
+
+def profiles_collapsed():
+    """One "root;frame;...;leaf count" line per stack; the key is the root frame."""
+    if not _authorized():
+        return _unauthorized()
+    wanted = request.args.get("key")
+    lines = []
+    with _lock:
+        for key, stacks in _collapsed.items():
+            if wanted and key != wanted:
+                continue
+            root = key.replace(";", ",")
+            for stack, count in stacks.items():
+                lines.append(f"{root};{stack} {count}")
+    return Response("\n".join(lines) + "\n", mimetype="text/plain")
+
+
+def profiles_pstats():
+    if not _authorized():
+        return _unauthorized()
+    wanted = request.args.get("key")
+    limit = request.args.get("limit", 40, type=int)
+    out = io.StringIO()
+    with _lock:
+        for key, stats in _pstats.items():
+            if wanted and key != wanted:
+                continue
+            out.write(f"==== {key} ({_requests[key]} requests) ====\n")
+            stats.stream = out
+            stats.sort_stats("cumulative").print_stats(limit)
+    return Response(out.getvalue(), mimetype="text/plain")
+
+
+def profiles_reset():
+    if not _authorized():
+        return _unauthorized()
+    with _lock:
+        _collapsed.clear()
+        _pstats.clear()
+        _requests.clear()
+        _seconds.clear()
+    return jsonify({"success": True}), 200
+
+
+def init_profiling(app):
+    app.before_request(_start_profile)
+    app.after_request(_stop_profile)
+    app.teardown_request(_abandon_profile)
+    app.add_url_rule("/admin/profiles", "profiles_summary", profiles_summary, methods=["GET"])
+    app.add_url_rule("/admin/profiles", "profiles_reset", profiles_reset, methods=["DELETE"])
+    app.add_url_rule(
+        "/admin/profiles/collapsed", "profiles_collapsed", profiles_collapsed, methods=["GET"]
+    )
+    app.add_url_rule("/admin/profiles/pstats", "profiles_pstats", profiles_pstats, methods=["GET"])
@@ -0,0 +1,252 @@
+# backend/ratelimit.py
+"""
+Sliding-window rate limiting for the OTP and login endpoints.
+
+Every limited route counts hits per client IP and, optionally, per email in
+the request body. A hit is allowed when fewer than `limit` hits were accepted
+in the last `window` seconds (an exact sliding log, not fixed buckets).
+Rejected requests get 429 + Retry-After before the view runs, so no DB query
+or email is spent on them. The IP is checked first because it doesn't need
+the body.
+
+Storage:
+  - default: in-process, per worker. Bounded LRU (RATELIMIT_MAX_KEYS) with
+    idle keys swept out, so a flood of distinct IPs/emails can't grow memory.
+  - RATELIMIT_STORAGE_URL=redis://...: shared across workers/hosts (needs
+    `pip install redis`); falls back to in-process if Redis is unreachable.
+
+Behind reverse proxies set TRUSTED_PROXY_COUNT so the IP comes from
+X-Forwarded-For, on both the Flask and the ASGI routes.
+
+RATELIMIT_ENABLED=0 turns it off (load tests from a single IP). Limits are
+"<hits>/<seconds>" strings: RATELIMIT_OTP_PER_IP, RATELIMIT_OTP_PER_EMAIL,
+RATELIMIT_OTP_VERIFY_PER_IP, RATELIMIT_OTP_VERIFY_PER_EMAIL (routes that check
+a code), RATELIMIT_LOGIN_PER_IP, RATELIMIT_LOGIN_PER_EMAIL.
+
+    @bp.route("/otp/register/request", methods=["POST"])
+    @rate_limit("otp_register", per_ip=OTP_PER_IP, per_email=OTP_PER_EMAIL)
+    def otp_register_request(): ...
+
+The same decorator works on the async Starlette handlers in asgi.py.
+"""
+import os
+import time
+import uuid
+import inspect
+from collections import OrderedDict, deque
+from functools import wraps
+from threading import Lock
+
+from flask import jsonify, request
+
+RATELIMIT_ENABLED = os.getenv("RATELIMIT_ENABLED", "1") != "0"
+RATELIMIT_STORAGE_URL = os.getenv("RATELIMIT_STORAGE_URL")
+
+redis = None
+if RATELIMIT_STORAGE_URL:
+    try:
+        import redis
+    except ImportError:  # optional, only for a shared store
+        redis = None
+RATELIMIT_MAX_KEYS = int(os.getenv("RATELIMIT_MAX_KEYS", "100000"))
+
+# Reverse proxies in front of the app (0 = clients connect directly). The
+# Flask app gets the client IP through ProxyFix (app.create_app); the ASGI
+# handlers go through client_ip() below with the same rule.
+TRUSTED_PROXY_COUNT = int(os.getenv("TRUSTED_PROXY_COUNT", "0"))
+
+
+def parse_limit(value):
+    """'5/60' -> (5, 60.0): at most 5 hits per 60 seconds."""
+    hits, seconds = value.split("/", 1)
+    return int(hits), float(seconds)
+
+
+# OTP sends cost mail quota; password and OTP checks are what brute-forcing
+# targets. A code lives 5 minutes, so OTP_VERIFY_PER_EMAIL allows a handful of
+# tries per code out of a million.
+OTP_PER_IP = parse_limit(os.getenv("RATELIMIT_OTP_PER_IP", "10/60"))
+OTP_PER_EMAIL = parse_limit(os.getenv("RATELIMIT_OTP_PER_EMAIL", "3/600"))
+LOGIN_PER_IP = parse_limit(os.getenv("RATELIMIT_LOGIN_PER_IP", "20/60"))
+LOGIN_PER_EMAIL = parse_limit(os.getenv("RATELIMIT_LOGIN_PER_EMAIL", "10/600"))
+OTP_VERIFY_PER_IP = parse_limit(os.getenv("RATELIMIT_OTP_VERIFY_PER_IP", "30/60"))
+OTP_VERIFY_PER_EMAIL = parse_limit(os.getenv("RATELIMIT_OTP_VERIFY_PER_EMAIL", "5/300"))
+
+TOO_MANY_MESSAGE = "Too many requests, please try again later"
+
+
+class MemoryStore:
+    """Per-process sliding logs: key -> deque of accepted hit times."""
+
+    def __init__(self, max_keys=RATELIMIT_MAX_KEYS, sweep_every=1000):
+        self.max_keys = max_keys
+        self.sweep_every = sweep_every
+        self._logs = OrderedDict()  # key -> (window, deque); LRU order
+        self._lock = Lock()
+        self._ops = 0
+
+    def hit(self, key, limit, window, now=None):
+        """Record a hit if allowed; return 0 when allowed, else seconds to wait."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._logs.get(key)
+            if entry is None:
+                entry = self._logs[key] = (window, deque(maxlen=limit))
+            else:
+                self._logs.move_to_end(key)
+            log = entry[1]
+            while log and log[0] <= now - window:
+                log.popleft()
+            if len(log) >= limit:
+                return log[0] + window - now
+            log.append(now)
+
+            self._ops += 1
+            if len(self._logs) > self.max_keys:
+                self._logs.popitem(last=False)
+            if self._ops % self.sweep_every == 0:
+                self._sweep(now)
+            return 0
+
+    def _sweep(self, now):
+        # Oldest-touched keys first; stop at the first one still in use.
+        while self._logs:
+            key, (window, log) = next(iter(self._logs.items()))
+            if log and log[-1] > now - window:
+                break
+            del self._logs[key]
+
+    def __len__(self):
+        return len(self._logs)
+
+
+class RedisStore:
+    """Shared sliding logs as Redis sorted sets (score = hit time)."""
+
+    def __init__(self, url, fallback):
+        self.client = redis.Redis.from_url(url, socket_timeout=0.25)
+        self.fallback = fallback
+
+    def hit(self, key, limit, window, now=None):
+        now = time.time() if now is None else now
+        rkey = f"ratelimit:{key}"
+        try:
+            pipe = self.client.pipeline()
+            pipe.zremrangebyscore(rkey, 0, now - window)
+            pipe.zrange(rkey, 0, 0, withscores=True)
+            pipe.zcard(rkey)
+            _, oldest, count = pipe.execute()
+            if count >= limit:
+                return oldest[0][1] + window - now if oldest else window
+            pipe = self.client.pipeline()
+            pipe.zadd(rkey, {uuid.uuid4().hex: now})
+            pipe.expire(rkey, int(window) + 1)
+            pipe.execute()
+            return 0
+        except redis.RedisError as e:
+            print("[RATELIMIT] Redis unavailable, using in-process store:", e)
+            return self.fallback.hit(key, limit, window)
+
+
+def make_store():
+    memory = MemoryStore()
+    if RATELIMIT_STORAGE_URL:
+        if redis is None:
+            print("❗ RATELIMIT_STORAGE_URL set but `redis` is not installed; using in-process store.")
+        else:
+            return RedisStore(RATELIMIT_STORAGE_URL, memory)
+    return memory
+
+
+class RateLimiter:
+    def __init__(self, store=None):
+        self.store = store or make_store()
+        self.rejected = {}  # (scope, "ip"|"email") -> count, for /metrics
+        self._lock = Lock()
+
+    def check(self, scope, kind, value, limit, window):
+        """0 if the hit is allowed (and recorded), else seconds until it would be."""
+        retry_after = self.store.hit(f"{scope}:{kind}:{value}", limit, window)
+        if retry_after:
+            with self._lock:
+                self.rejected[(scope, kind)] = self.rejected.get((scope, kind), 0) + 1
+        return retry_after
+
+
+limiter = RateLimiter()
+
+
+def client_ip(peer, forwarded_for, hops=TRUSTED_PROXY_COUNT):
+    """
+    Client IP behind `hops` trusted proxies, as ProxyFix(x_for=hops) picks
+    it: the hops-th X-Forwarded-For entry from the right (entries further
+    left are whatever the client sent). The peer address otherwise.
+    """
+    if hops and forwarded_for:
+        values = [v.strip() for v in forwarded_for.split(",")]
+        if len(values) >= hops:
+            return values[-hops]
+    return peer
+
+
+def _email_key(data):
+    return (data.get("email") or "").strip().lower() if isinstance(data, dict) else ""
+
+
+def rate_limit(scope, per_ip=None, per_email=None):
+    """
+    Reject with 429 once a client IP exceeds `per_ip` = (limit, window seconds)
+    or the body's "email" exceeds `per_email` within the sliding window.
+    """
+
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+            from starlette.responses import JSONResponse
+
+            @wraps(fn)
+            async def async_wrapper(req, *args, **kwargs):
+                if RATELIMIT_ENABLED:
+                    retry_after = 0
+                    ip = client_ip(
+                        req.client.host if req.client else None, req.headers.get("x-forwarded-for")
+                    )
+                    if per_ip and ip:
+                        retry_after = limiter.check(scope, "ip", ip, *per_ip)
+                    if not retry_after and per_email:
+                        try:
+                            email = _email_key(await req.json())
+                        except ValueError:
+                            email = ""
+                        if email:
+                            retry_after = limiter.check(scope, "email", email, *per_email)
+                    if retry_after:
+                        return JSONResponse(
+                            {"success": False, "message": TOO_MANY_MESSAGE},
+                            status_code=429,
+                            headers={"Retry-After": str(int(retry_after) + 1)},
+                        )
+                return await fn(req, *args, **kwargs)
+
+            return async_wrapper
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if RATELIMIT_ENABLED:
+                retry_after = 0
+                if per_ip and request.remote_addr:
+                    retry_after = limiter.check(scope, "ip", request.remote_addr, *per_ip)
+                if not retry_after and per_email:
+                    email = _email_key(request.get_json(silent=True))
+                    if email:
+                        retry_after = limiter.check(scope, "email", email, *per_email)
+                if retry_after:
+                    return (
+                        jsonify({"success": False, "message": TOO_MANY_MESSAGE}),
+                        429,
+                        {"Retry-After": str(int(retry_after) + 1)},
+                    )
+            return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,180 @@
+# backend/serialization.py
+"""
+JSON serialization and response compression for the Flask app.
+
+  - `jsonify` goes through orjson when it is installed (stdlib json otherwise).
+  - Responses above COMPRESS_MIN_SIZE are brotli/gzip encoded according to
+    the client's Accept-Encoding (brotli only when the package is installed).
+  - Catalog responses can be kept pre-compressed in `catalog_cache`, so the
+    big /internships body is compressed once per encoding, not per request.
+"""
+import os
+import gzip
+from collections import OrderedDict
+from threading import Lock
+
+from flask import Response, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
+CATALOG_CACHE_SIZE = int(os.getenv("CATALOG_CACHE_SIZE", "256"))
+
+COMPRESSIBLE_MIMETYPES = {"application/json", "text/plain", "text/html", "text/css"}
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Drop-in JSON provider backed by orjson; same output keys and types."""
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # callers asking for stdlib-specific options (indent, cls, ...)
+            return super().dumps(obj, **kwargs)
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        body = orjson.dumps(obj, default=self.default, option=option)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+# ---------------------------
+# Content-Encoding negotiation
+# ---------------------------
+def negotiate_encoding():
+    """Best encoding the current client accepts: 'br', 'gzip' or None."""
+    accepted = request.accept_encodings
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = None, 0
+    for enc in candidates:
+        q = accepted[enc]
+        if q > best_q:
+            best, best_q = enc, q
+    return best
+
+
+def compress(data: bytes, encoding):
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    if encoding == "gzip":
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+    return data
+
+
+def _finish(response, body, encoding):
+    response.set_data(body)
+    if encoding:
+        response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def compress_response(response):
+    """after_request hook: encode large text bodies for clients that accept it."""
+    if (
+        response.direct_passthrough
+        or response.status_code < 200
+        or response.status_code in (204, 206, 304)
+        or "Content-Encoding" in response.headers
+        or response.mimetype not in COMPRESSIBLE_MIMETYPES
+    ):
+        return response
+
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
+
+    encoding = negotiate_encoding()
+    if encoding is None:
+        response.vary.add("Accept-Encoding")
+        return response
+    return _finish(response, compress(data, encoding), encoding)
+
+
+# ---------------------------
+# Pre-compressed catalog cache
+# ---------------------------
+class PrecompressedCache:
+    """Small LRU of encoded response bodies keyed by (key, encoding)."""
+
+    def __init__(self, max_entries=CATALOG_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return body
+
+    def put(self, key, body):
+        with self._lock:
+            self._entries[key] = body
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+catalog_cache = PrecompressedCache()
+
+
+def cached_json_response(key, build, status=200):
+    """
+    JSON response for a cacheable catalog `key`.
+
+    `build()` returns the body as bytes or a list of bytes-like chunks and is
+    only called on a cache miss; the body is stored already encoded for the
+    negotiated Content-Encoding, so hits skip both building and compression.
+    """
+    encoding = negotiate_encoding()
+    cached = catalog_cache.get((key, encoding))
+    if cached is None:
+        data = build()
+        if not isinstance(data, (bytes, bytearray)):
+            data = b"".join(data)
+        used = encoding if len(data) >= COMPRESS_MIN_SIZE else None
+        cached = (compress(data, used), used)
+        catalog_cache.put((key, encoding), cached)
+
+    body, used = cached
+    response = Response(status=status, mimetype="application/json")
+    return _finish(response, body, used)
+
+
+def init_serialization(app):
+    if orjson is not None:
+        app.json = OrjsonProvider(app)
+    app.after_request(compress_response)
@@ -0,0 +1,156 @@
+# backend/stats.py
+"""
+Application summary tables: counts per internship, domain, college and day.
+
+The counters are folded in incrementally, keyed on the last processed
+Applications.id (stats_state."applications_last_id"):
+
+  - `app.migrate()` (run by the gunicorn master on start and by the
+    migrate command) folds in everything past the watermark, so existing
+    rows are counted on the first deploy.
+  - /apply commits the application, then calls record_application() in a
+    second transaction. That folds in at most STATS_CATCHUP_ROWS older rows
+    still behind the watermark (bulk loads, an earlier failed update) and
+    then the new row, so a backlog drains over the next few applications
+    without any request scanning all of it while holding the write lock.
+    If it fails the row is still saved, just not counted yet.
+  - `python stats.py rollup` folds in everything past the watermark at once.
+  - `python stats.py rebuild` recounts everything from scratch.
+
+Applications has no timestamp column, so only rows counted at /apply time
+land in daily_stats; backfilled rows count everywhere else.
+"""
+import os
+from datetime import datetime
+
+from sqlalchemy import func, text
+
+from models import (
+    db, Applications, Internships,
+    InternshipStats, DomainStats, CollegeStats, DailyStats, StatsState,
+)
+
+WATERMARK = "applications_last_id"
+STATS_CATCHUP_ROWS = int(os.getenv("STATS_CATCHUP_ROWS", "500"))
+
+# Portable upsert (SQLite >= 3.24, PostgreSQL).
+UPSERT_SQL = (
+    "INSERT INTO {table} ({key}, applications) VALUES (:key, :n) "
+    "ON CONFLICT({key}) DO UPDATE SET applications = {table}.applications + excluded.applications"
+)
+
+
+def _upsert(session, model, key_column, counts):
+    if not counts:
+        return
+    sql = text(UPSERT_SQL.format(table=model.__tablename__, key=key_column))
+    session.execute(sql, [{"key": k, "n": n} for k, n in counts.items()])
+
+
+def split_domains(domains):
+    return [d.strip() for d in (domains or "").split(",") if d.strip()]
+
+
+def _watermark(session):
+    state = session.get(StatsState, WATERMARK)
+    if state is None:
+        state = StatsState(name=WATERMARK, value=0)
+        session.add(state)
+    return state
+
+
+def rollup(session=None, upto=None, day=None):
+    """
+    Fold Applications rows with watermark < id <= upto (default: all) into
+    the summary tables and advance the watermark. `day` (YYYY-MM-DD) also
+    credits them to daily_stats. Doesn't commit. Returns the rows folded in.
+    """
+    session = session or db.session
+    state = _watermark(session)
+    query = session.query(
+        Applications.internship_id, Applications.college_name, func.count(), func.max(Applications.id)
+    ).filter(Applications.id > state.value)
+    if upto is not None:
+        query = query.filter(Applications.id <= upto)
+    groups = query.group_by(Applications.internship_id, Applications.college_name).all()
+    if not groups:
+        if upto is not None:
+            state.value = max(state.value, upto)  # nothing there; skip the id gap
+        return 0
+
+    per_internship, per_college = {}, {}
+    last_id = state.value
+    for internship_id, college, n, max_id in groups:
+        per_internship[internship_id] = per_internship.get(internship_id, 0) + n
+        college = (college or "").strip()
+        if college:
+            per_college[college] = per_college.get(college, 0) + n
+        last_id = max(last_id, max_id)
+
+    per_domain = {}
+    domain_rows = session.query(Internships.id, Internships.domains).filter(
+        Internships.id.in_(list(per_internship))
+    )
+    for internship_id, domains in domain_rows:
+        for domain in split_domains(domains):
+            per_domain[domain] = per_domain.get(domain, 0) + per_internship[internship_id]
+
+    total = sum(per_internship.values())
+    _upsert(session, InternshipStats, "internship_id", per_internship)
+    _upsert(session, DomainStats, "domain", per_domain)
+    _upsert(session, CollegeStats, "college", per_college)
+    if day:
+        _upsert(session, DailyStats, "day", {day: total})
+    state.value = last_id if upto is None else max(last_id, upto)
+    return total
+
+
+def record_application(application, session=None):
+    """
+    Count one new application; doesn't commit. First folds in up to
+    STATS_CATCHUP_ROWS older rows behind the watermark. If some are still
+    left after that, this row waits for a later call too and only its
+    daily_stats credit is added now (rollup never writes daily_stats without
+    a day, so nothing is counted twice).
+    """
+    session = session or db.session
+    day = datetime.utcnow().strftime("%Y-%m-%d")
+    state = _watermark(session)
+    if state.value < application.id - 1:
+        rollup(session, upto=min(state.value + STATS_CATCHUP_ROWS, application.id - 1))
+    backlog = session.query(Applications.id).filter(
+        Applications.id > state.value, Applications.id < application.id
+    ).first()
+    if backlog is None:
+        rollup(session, upto=application.id, day=day)
+    else:
+        _upsert(session, DailyStats, "day", {day: 1})
+
+
+def rebuild(session=None):
+    """Recount the internship/domain/college tables; daily_stats is kept."""
+    session = session or db.session
+    for model in (InternshipStats, DomainStats, CollegeStats):
+        session.query(model).delete()
+    _watermark(session).value = 0
+    return rollup(session)
+
+
+def main():
+    import argparse
+    from app import create_app
+
+    parser = argparse.ArgumentParser(description="Maintain application summary tables.")
+    parser.add_argument("command", choices=["rollup", "rebuild"])
+    args = parser.parse_args()
+
+    app = create_app()
+    with app.app_context():
+        count = rollup() if args.command == "rollup" else rebuild()
+        db.session.commit()
+        last_id = _watermark(db.session).value
+    print(f"📊 {args.command}: folded in {count} applications (last id {last_id})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 import 'package:flutter/material.dart';
 import '../widgets/navbar.dart';
 import '../theme/app_colors.dart';
+import '../services/api_service.dart';
 
 class CompaniesPage extends StatefulWidget {
   const CompaniesPage({super.key});
@@ -18,88 +19,60 @@ class _CompaniesPageState extends State<CompaniesPage> {
   String _searchTerm = '';
 
   // ---------------------------------------------------------------------------
-  // MOCK INTERNSHIPS (frontend only, no backend call => no CORS)
+  // INTERNSHIPS (local catalog from ApiService, refreshed with deltas)
   // ---------------------------------------------------------------------------
 
-  final List<Map<String, dynamic>> _allInternships = [
-    {
-      'id': 1,
-      'name': 'DataForge Labs',
-      'role': 'Data Science Intern',
-      'domains': ['Data Science', 'Machine Learning'],
-      'skills': ['Python', 'Pandas', 'SQL', 'TensorFlow'],
-      'location': 'Chennai',
-      'mode': 'onsite',
-      'paid': true,
-      'stipend': 15000,
-      'about':
-          'DataForge Labs works on building data pipelines, dashboards and ML models for real business problems.',
-      'prerequisites':
-          'Strong Python skills, curiosity to explore data and willingness to learn.',
-      'extra':
-          'Certificate, letter of recommendation and chance to convert to full-time role.',
-    },
-    {
-      'id': 2,
-      'name': 'FinTrack',
-      'role': 'Data Analyst Intern',
-      'domains': ['Data Science', 'Web Development'],
-      'skills': ['Python', 'SQL', 'Tableau'],
-      'location': 'Remote',
-      'mode': 'remote',
-      'paid': true,
-      'stipend': 13000,
-      'about':
-          'FinTrack builds tools to track personal finances and investment portfolios.',
-      'prerequisites': 'Good communication skills and basic statistics.',
-      'extra': 'Flexible working hours, remote-first team.',
-    },
-    {
-      'id': 3,
-      'name': 'PixelCraft Studios',
-      'role': 'Frontend Web Intern',
-      'domains': ['Web Development'],
-      'skills': ['HTML', 'CSS', 'JavaScript', 'React'],
-      'location': 'Bengaluru',
-      'mode': 'onsite',
-      'paid': true,
-      'stipend': 10000,
-      'about':
-          'PixelCraft designs modern, responsive websites for startups and creators.',
-      'prerequisites': 'Basic React knowledge and a small portfolio.',
-      'extra': 'You will work with designers and another senior developer.',
-    },
-    {
-      'id': 4,
-      'name': 'CloudNova',
-      'role': 'Cloud & DevOps Intern',
-      'domains': ['Cloud Computing'],
-      'skills': ['AWS', 'Docker', 'CI/CD'],
-      'location': 'Hyderabad',
-      'mode': 'remote',
-      'paid': false,
-      'stipend': 0,
-      'about':
-          'CloudNova helps companies migrate their infrastructure to the cloud.',
-      'prerequisites': 'Comfortable with Linux and basic networking concepts.',
-      'extra': 'Hands-on experience deploying services to AWS.',
-    },
-    {
-      'id': 5,
-      'name': 'SecureGate',
-      'role': 'Cybersecurity Intern',
-      'domains': ['Cybersecurity'],
-      'skills': ['Python', 'Kali Linux', 'Burp Suite'],
-      'location': 'Pune',
-      'mode': 'onsite',
-      'paid': true,
-      'stipend': 8000,
-      'about':
-          'SecureGate performs security audits and penetration testing for clients.',
-      'prerequisites': 'Basic understanding of networks and web applications.',
-      'extra': 'You will shadow senior security engineers on live projects.',
-    },
-  ];
+  List<Map<String, dynamic>> _allInternships = [];
+  bool _loading = true;
+
+  @override
+  void initState() {
+    super.initState();
+    _loadInternships();
+  }
+
+  Future<void> _loadInternships() async {
+    // show the stored copy right away, then apply whatever changed
+    final cached = await ApiService.cachedInternships();
+    if (!mounted) return;
+    setState(() {
+      _allInternships = cached.map(_fromApi).toList();
+      _loading = cached.isEmpty;
+    });
+
+    final fresh = await ApiService.syncInternships();
+    if (!mounted) return;
+    setState(() {
+      _allInternships = fresh.map(_fromApi).toList();
+      _loading = false;
+    });
+  }
+
+  /// Backend row (comma-separated strings) -> the shape the cards use.
+  static Map<String, dynamic> _fromApi(Map<String, dynamic> row) {
+    List<String> split(dynamic v) => (v ?? '')
+        .toString()
+        .split(',')
+        .map((e) => e.trim())
+        .where((e) => e.isNotEmpty)
+        .toList();
+    final digits = RegExp(r'\d+').firstMatch((row['stipend'] ?? '').toString().replaceAll(',', ''));
+
+    return {
+      'id': row['id'],
+      'name': row['name'],
+      'role': row['role'],
+      'domains': split(row['domains']),
+      'skills': split(row['skills']),
+      'location': row['location'],
+      'mode': (row['mode'] ?? '').toString().toLowerCase(),
+      'paid': (row['paid'] ?? '').toString().toLowerCase() == 'yes',
+      'stipend': digits != null ? int.parse(digits.group(0)!) : 0,
+      'duration': row['duration'],
+      'prerequisites': row['prerequisites'],
+      'extra': row['other'],
+    };
+  }
 
   // ---------------------------------------------------------------------------
 
@@ -126,8 +99,9 @@ class _CompaniesPageState extends State<CompaniesPage> {
       if (_paidFilter == 'unpaid' && paid) return false;
 
       // mode filter
-      if (_modeFilter == 'remote' && mode != 'remote') return false;
-      if (_modeFilter == 'onsite' && mode != 'onsite') return false;
+      // merged listings can offer several modes, e.g. "onsite, remote"
+      if (_modeFilter == 'remote' && !mode.contains('remote')) return false;
+      if (_modeFilter == 'onsite' && !mode.contains('onsite')) return false;
 
       // stipend filter
       if (_stipendFilter == '0-5' && stipend > 5000) return false;
@@ -274,7 +248,9 @@ class _CompaniesPageState extends State<CompaniesPage> {
           const SizedBox(height: 8),
 
           Expanded(
-            child: results.isEmpty
+            child: _loading
+                ? const Center(child: CircularProgressIndicator())
+                : results.isEmpty
                 ? const Center(child: Text('No internships found'))
                 : ListView.builder(
                     padding: const EdgeInsets.fromLTRB(16, 0, 16, 16),
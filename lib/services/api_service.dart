@@ -2,6 +2,7 @@
 import 'dart:convert';
 // used only when a local path is passed (native platforms)
 import 'package:http/http.dart' as http;
+import 'package:shared_preferences/shared_preferences.dart';
 
 /// ApiService - low-level HTTP helpers plus high-level wrappers
 /// The high-level wrappers return Map so UI code can read keys like
@@ -147,6 +148,88 @@ class ApiService {
     }
   }
 
+  // --- Local catalog, kept current with /internships/changes ---
+  // The whole catalog is stored on the device (SharedPreferences) together
+  // with the last change-log version seen, so pages can filter offline and
+  // a refresh only downloads what changed since then.
+  static const String _catalogItemsKey = 'catalog_items';
+  static const String _catalogVersionKey = 'catalog_version';
+  static final Map<int, Map<String, dynamic>> _catalog = {};
+  static int _catalogVersion = 0;
+  static bool _catalogLoaded = false;
+
+  static Future<void> _loadCatalog() async {
+    if (_catalogLoaded) return;
+    _catalogLoaded = true;
+    try {
+      final sp = await SharedPreferences.getInstance();
+      final raw = sp.getString(_catalogItemsKey);
+      if (raw != null) {
+        for (final item in jsonDecode(raw) as List) {
+          final m = Map<String, dynamic>.from(item as Map);
+          if (m['id'] is int) _catalog[m['id'] as int] = m;
+        }
+        _catalogVersion = sp.getInt(_catalogVersionKey) ?? 0;
+      }
+    } catch (_) {
+      // corrupt or missing cache -> start from scratch
+      _catalog.clear();
+      _catalogVersion = 0;
+    }
+  }
+
+  static Future<void> _saveCatalog() async {
+    try {
+      final sp = await SharedPreferences.getInstance();
+      await sp.setString(_catalogItemsKey, jsonEncode(_catalog.values.toList()));
+      await sp.setInt(_catalogVersionKey, _catalogVersion);
+    } catch (_) {}
+  }
+
+  /// Internships in the local store, by id (no network).
+  static Future<List<Map<String, dynamic>>> cachedInternships() async {
+    await _loadCatalog();
+    final items = _catalog.values.toList();
+    items.sort((a, b) => (a['id'] as int).compareTo(b['id'] as int));
+    return items;
+  }
+
+  /// Applies every change since the stored version and returns the updated
+  /// local catalog. Offline or on errors, the cached copy is returned as is.
+  static Future<List<Map<String, dynamic>>> syncInternships() async {
+    await _loadCatalog();
+    final int startVersion = _catalogVersion;
+    bool changed = false;
+    try {
+      bool hasMore = true;
+      while (hasMore) {
+        final res = _safeDecode(await get('/internships/changes?since=$_catalogVersion'));
+        if (res['success'] != true) break;
+
+        if (res['reset'] == true) {
+          _catalog.clear();
+          changed = true;
+        }
+        for (final item in (res['upserts'] as List? ?? const [])) {
+          final m = Map<String, dynamic>.from(item as Map);
+          if (m['id'] is int) {
+            _catalog[m['id'] as int] = m;
+            changed = true;
+          }
+        }
+        for (final id in (res['deletes'] as List? ?? const [])) {
+          if (id is int && _catalog.remove(id) != null) changed = true;
+        }
+        _catalogVersion = (res['version'] as num?)?.toInt() ?? _catalogVersion;
+        hasMore = res['has_more'] == true;
+      }
+    } catch (_) {
+      // offline: keep what we have
+    }
+    if (changed || _catalogVersion != startVersion) await _saveCatalog();
+    return cachedInternships();
+  }
+
   // --- Helper ---
   static Map<String, dynamic> _safeDecode(http.Response res) {
     final int code = res.statusCode;